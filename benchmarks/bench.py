@@ -0,0 +1,214 @@
+"""
+Benchmarks of the library's hot paths, compared against stored baselines.
+
+    python benchmarks/bench.py                      # Run everything and compare to the baseline
+    python benchmarks/bench.py -k buck              # Only the benchmarks with "buck" in their name
+    python benchmarks/bench.py --save-baseline      # Store the results as the new baseline
+
+Timings depend on the machine, so the baselines file is kept per machine rather than in the
+repository. CI (.github/workflows/benchmarks.yml) keeps the runner's in its cache and updates it
+on every push to main. The exit status is 1 if any benchmark failed or got slower than its
+baseline by more than the threshold.
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from skidl import Net, POWER, reset
+
+from simple_skidl_parts.parts_wrapper import TrackedPart, create_bom
+from simple_skidl_parts.units.linear import get_value_name, e_series_number
+from simple_skidl_parts.analog.power_data import get_lm2596_inductor_value
+from simple_skidl_parts.analog import power
+from simple_skidl_parts.analog.led import led_simple, LedSingleColors
+from simple_skidl_parts.digital.esp import esp32_s2_with_serial_usb, esp32_wroom_external_programmer
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+_BENCHMARKS: Dict[str, Callable[[], None]] = {}
+
+
+def benchmark(name: str):
+    """
+    Registers a benchmark. The function runs after a reset() of the default circuit, only its
+    own time is measured.
+    """
+    def _register(func):
+        _BENCHMARKS[name] = func
+        return func
+    return _register
+
+
+def _power_nets():
+    vin, vout, gnd = Net("VIN"), Net("VOUT"), Net("GND")
+    for n in (vin, vout, gnd):
+        n.drive = POWER
+    return vin, vout, gnd
+
+
+@benchmark("tracked_part_x100")
+def _tracked_parts():
+    for _ in range(50):
+        TrackedPart("Device", "C", value="100n")
+        TrackedPart("Device", "R", value="10K")
+
+
+@benchmark("get_value_name_x1000")
+def _value_names():
+    for i in range(1000):
+        get_value_name(10**(i/100-3))
+
+
+@benchmark("e_series_number_x1000")
+def _e_series():
+    for i in range(1000):
+        e_series_number(10**(i/100-3), 96)
+
+
+@benchmark("get_lm2596_inductor_value")
+def _lm2596_inductor():
+    for current in (0.5, 1.0, 2.0, 3.0):
+        get_lm2596_inductor_value(current, 20)
+
+
+@benchmark("buck_step_down_exact_input")
+def _buck_exact():
+    vin, vout, gnd = _power_nets()
+    power.buck_step_down_exact_input(vin, vout, gnd, 5, 24, 2.0)
+
+
+@benchmark("buck_step_down_regular")
+def _buck_regular():
+    vin, vout, gnd = _power_nets()
+    power.buck_step_down_regular(vin, vout, gnd, 3.3, 15, 6, 2.0)
+
+
+@benchmark("low_dropout_power")
+def _ldo():
+    vin, vout, gnd = _power_nets()
+    power.low_dropout_power(vin, vout, gnd, 12, 5, 0.4, True)
+
+
+@benchmark("reverse_polarity_protection")
+def _rpp():
+    vin, vout, gnd = _power_nets()
+    # Packages only take keyword arguments and are connected through their interface
+    rpp = power.reverse_polarity_protection(input_voltage=12, max_current=1.0)
+    rpp.vin += vin
+    rpp.vout += vout
+    rpp.gnd += gnd
+    builtins.default_circuit.instantiate_packages()
+
+
+@benchmark("led_simple_x20")
+def _leds():
+    gnd = Net("GND")
+    for i in range(20):
+        led = led_simple(sig_voltage=3.3, color=LedSingleColors.GREEN, size=1.6)
+        led.signal += Net(f"SIG{i}")
+        led.gnd += gnd
+    builtins.default_circuit.instantiate_packages()
+
+
+@benchmark("esp32_s2_with_serial_usb")
+def _esp32_s2():
+    Net("GND"), Net("+3V3")  # The builder attaches to these
+    esp32_s2_with_serial_usb(TrackedPart("RF_Module", "ESP32-S2-WROVER-I"))
+
+
+@benchmark("esp32_wroom_external_programmer")
+def _esp32_wroom():
+    mcu = TrackedPart("RF_Module", "ESP32-WROOM-32D", footprint="ESP32-WROOM-32", sku="JLCPCB:C701343")
+    _, v33, gnd = _power_nets()
+    esp32_wroom_external_programmer(mcu, v33, gnd)
+
+
+def _bom_benchmark(num_parts: int):
+    def _run():
+        for i in range(num_parts):
+            TrackedPart("Device", "R", value="10K", sku="JLCPCB:C17414")
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as f:
+            create_bom("JLCPCB", f.name, builtins.default_circuit)
+    return _run
+
+for _n in (100, 1000, 10000):
+    benchmark(f"create_bom_{_n}_parts")(_bom_benchmark(_n))
+
+
+def run(name: str, repeat: int) -> Dict[str, float]:
+    func = _BENCHMARKS[name]
+    times: List[float] = []
+    # The first run fills the process wide caches (templates, libraries) and isn't counted
+    for _ in range(repeat+1):
+        reset()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter()-start)
+    times = times[1:]
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the library's hot paths")
+    parser.add_argument("-k", dest="select", default="", help="Only run benchmarks containing this string")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("-t", "--threshold", type=float, default=0.25,
+                        help="Allowed slowdown relative to the baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINES, help="Baselines JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    base_results = baseline.get("results", {})
+    results, regressions, failures = {}, [], []
+    for name in _BENCHMARKS:
+        if args.select not in name:
+            continue
+        try:
+            res = run(name, args.repeat)
+        except Exception as e:  # One broken benchmark doesn't stop the others
+            print(f"{name:40s} FAILED: {type(e).__name__}: {e}")
+            failures.append(name)
+            continue
+        results[name] = res
+        line = f"{name:40s} min {res['min']*1000:10.2f}ms  median {res['median']*1000:10.2f}ms"
+        if name in base_results:
+            change = res["min"]/base_results[name]["min"] - 1
+            line += f"  {change:+7.1%}"
+            if change > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if failures:
+        print(f"{len(failures)} benchmark(s) failed: {', '.join(failures)}")
+
+    if args.save_baseline:
+        base_results.update(results)
+        baseline = {
+            "machine": platform.node(),
+            "python": platform.python_version(),
+            "results": base_results,
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        print(f"Saved baseline to {args.baseline}")
+        return 1 if failures else 0
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,7 +40,7 @@ def connect_power(vout: Net, vin: Net, gnd: Net) -> Net:
 def connect_single_row(to_connect: List, ref: str):
     # Connect to a single row
     num_terms = len(to_connect)*2
-    connect = Part("Connector", f"Screw_Terminal_01x{num_terms:02d}", footprint="PhoenixContact_MSTBVA_2,5_2-G_1x{num_terms:02d}_P5.00mm_Vertical", ref=ref)
+    connect = Part("Connector", f"Screw_Terminal_01x{num_terms:02d}", footprint=f"PhoenixContact_MSTBVA_2,5_2-G_1x{num_terms:02d}_P5.00mm_Vertical", ref=ref)
     for i, otc in enumerate(to_connect):
         connect[i*2+1] += otc.load1
         connect[i*2+2] += otc.load2
@@ -0,0 +1,77 @@
+"""
+Parametric database of active components (MOSFETs, diodes and regulators) used to choose parts
+automatically. The data lives in active_parts.json; prices are approximate unit prices (USD)
+that are only used to rank the parts that qualify.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from ..catalog import load_catalogs
+
+_CATALOGS = load_catalogs(Path(__file__).parent / "active_parts.json")
+
+def _constraints(**kv) -> Dict:
+    return {k: v for k, v in kv.items() if v is not None}
+
+def select_mosfet(channel: str, v_gate: float = None, current: float = None, voltage: float = None,
+                  packages: Sequence[str] = None, strict: bool = False) -> Optional[Dict]:
+    """
+    Returns the cheapest MOSFET that qualifies.
+
+    Args:
+        channel (str): "N" or "P"
+        v_gate (float, optional): The available gate drive (the MOSFET must be fully on at this Vgs)
+        current (float, optional): Minimal continuous drain current (A)
+        voltage (float, optional): Minimal drain-source voltage rating (V)
+        packages (Sequence[str], optional): Only choose from these packages
+        strict (bool, optional): The current and voltage ratings must exceed (not just meet) the
+            requirements. Defaults to False.
+
+    Returns:
+        Optional[Dict]: The database row or None if nothing qualifies
+    """
+    rows = _CATALOGS["mosfets"].query(
+        equals={"channel": channel},
+        mins=_constraints(id_max=current, vds_max=voltage),
+        maxs=_constraints(vgs_on=v_gate))
+    for row in rows:
+        if packages is not None and row["package"] not in packages:
+            continue
+        if strict and (row["id_max"] == current or row["vds_max"] == voltage):
+            continue
+        return row
+    return None
+
+def select_diode(kind: str, current: float = None, voltage: float = None) -> Optional[Dict]:
+    """
+    Returns the cheapest diode that qualifies.
+
+    Args:
+        kind (str): "schottky", "rectifier" or "zener"
+        current (float, optional): Minimal average forward current (A)
+        voltage (float, optional): Minimal reverse voltage rating (V)
+
+    Returns:
+        Optional[Dict]: The database row or None if nothing qualifies
+    """
+    return _CATALOGS["diodes"].cheapest(
+        equals={"kind": kind},
+        mins=_constraints(if_max=current, vr_max=voltage))
+
+def select_regulator(kind: str, vout: float = None, vin: float = None, current: float = None) -> Optional[Dict]:
+    """
+    Returns the cheapest regulator that qualifies.
+
+    Args:
+        kind (str): "linear" or "buck"
+        vout (float, optional): Fixed output voltage. Adjustable regulators are not returned when given.
+        vin (float, optional): Maximal input voltage the regulator has to withstand (V)
+        current (float, optional): Minimal output current (A)
+
+    Returns:
+        Optional[Dict]: The database row or None if nothing qualifies
+    """
+    return _CATALOGS["regulators"].cheapest(
+        equals=_constraints(kind=kind, vout=vout),
+        mins=_constraints(vin_max=vin, iout_max=current))
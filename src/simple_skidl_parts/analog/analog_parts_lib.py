@@ -1,46 +1,64 @@
-
+"""
+Custom parts that are missing from KiCad. The parts are declared in custom_parts.json and compiled
+into a skidl library (skidl_libs/External_sklib.py) only when the declarations change.
+"""
 
 from pathlib import Path
+from functools import lru_cache
+import hashlib
+import json
+
 from skidl import *
 
 SSP_LIB_PATH = str((Path(__file__).parent.parent.parent.parent/"skidl_libs"/"External").absolute())
 
+_LIB_NAME = "External"
+_LIB_FILE = Path(SSP_LIB_PATH + "_sklib.py")
+_DECLARATIONS_FILE = Path(__file__).parent / "custom_parts.json"
+_HASH_PREFIX = "# declarations-hash: "
+
+def _declarations_hash() -> str:
+    return hashlib.sha256(_DECLARATIONS_FILE.read_bytes()).hexdigest()
+
+def _lib_is_stale() -> bool:
+    """
+    Returns True if the compiled library is missing or was compiled from other declarations.
+    """
+    try:
+        lines = _LIB_FILE.read_text().splitlines()
+    except OSError:
+        return True
+    return not lines or lines[-1] != _HASH_PREFIX + _declarations_hash()
+
 def _create_lib() -> None:
     """
-    Create a library with the required parts.
-    """
-    lib = SchLib(name="External")
-    
-    tps54331 = Part(name="TPS54331", tool=SKIDL, dest=TEMPLATE)
-    tps54331.ref_prefix = "U"
-    tps54331.description = "28-V, 3-A non-synchronous buck converter"
-    
-    pins = [
-        Pin(num=1, name="BOOT", func=Pin.types.INPUT),
-        Pin(num=2, name="VIN", func=Pin.types.PWRIN),
-        Pin(num=3, name="EN", func=Pin.types.INPUT),
-        Pin(num=4, name="SS", func=Pin.types.INPUT),
-        Pin(num=5, name="VSNS", func=Pin.types.INPUT),
-        Pin(num=6, name="COMP", func=Pin.types.INPUT),
-        Pin(num=7, name="GND", func=Pin.types.PWRIN),
-        Pin(num=8, name="PH", func=Pin.types.PWROUT)
-    ]
-    for p in pins:
-        tps54331 += p
-    
-    hlk_power = Part(name="HLK_10MXX", tool=SKIDL, dest=TEMPLATE)
-    hlk_power.ref_prefix = "U"
-    hlk_power.description = "Hilink 10Mxx power supply"
-    pins = [
-        Pin(num=1, name="ACP", func=Pin.types.PWRIN),
-        Pin(num=2, name="ACN", func=Pin.types.PWRIN),
-        Pin(num=3, name="VO-", func=Pin.types.PWROUT),
-        Pin(num=4, name="VO+", func=Pin.types.PWROUT),
-    ]
-    lib += tps54331
-    lib += hlk_power
-
-    lib.export(SSP_LIB_PATH)
+    Create a library with the parts declared in custom_parts.json.
+    """
+    with open(_DECLARATIONS_FILE) as f:
+        declarations = json.load(f)
+
+    lib = SchLib(name=_LIB_NAME)
+    for name, decl in declarations.items():
+        part = Part(name=name, tool=SKIDL, dest=TEMPLATE)
+        part.ref_prefix = decl["ref_prefix"]
+        part.description = decl["description"]
+        for p in decl["pins"]:
+            part += Pin(num=p["num"], name=p["name"], func=getattr(Pin.types, p["func"]))
+        lib += part
+
+    lib.export(_LIB_NAME, file_=str(_LIB_FILE))
+    with open(_LIB_FILE, "a") as f:
+        f.write(f"\n{_HASH_PREFIX}{_declarations_hash()}\n")
+
+@lru_cache(maxsize=None)
+def get_ssp_lib() -> SchLib:
+    """
+    Returns the library of the custom parts, compiling it first if the declarations changed.
+    The library is only loaded once per process.
+    """
+    if _lib_is_stale():
+        _create_lib()
+    return SchLib(SSP_LIB_PATH, tool=SKIDL)
 
 def main() -> None:
     """
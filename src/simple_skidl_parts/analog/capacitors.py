@@ -0,0 +1,72 @@
+"""
+Capacitor selection by capacitance and working voltage. A capacitor only qualifies if the working
+voltage is within its derated voltage rating, which depends on the dielectric (class 2 ceramics
+lose most of their capacitance near the rated voltage, electrolytics age faster).
+"""
+
+from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Optional
+import json
+
+from ..catalog import Catalog
+from ..parts_wrapper import TrackedPart
+from ..drc import ratings_from_row
+
+# Fraction of the rated voltage a capacitor may be used at, by dielectric.
+DERATING = {
+    "C0G": 0.8,
+    "X7R": 0.5,
+    "X5R": 0.5,
+    "tantalum": 0.5,
+    "electrolytic": 0.8,
+}
+
+# Capacitance values are E-series rounded, so accept anything within this relative distance.
+_CAPACITANCE_TOLERANCE = 0.02
+
+with open(Path(__file__).parent / "capacitors.json") as f:
+    _CATALOG = Catalog(json.load(f))
+
+@lru_cache(maxsize=None)
+def select_capacitor(capacitance: float, working_voltage: float, derating: Optional[float] = None,
+                     dielectric: Optional[str] = None, polarized: Optional[bool] = None) -> Optional[Dict]:
+    """
+    Returns the cheapest capacitor in the catalog for the given requirements.
+
+    Args:
+        capacitance (float): Required capacitance (F)
+        working_voltage (float): Maximum voltage across the capacitor (V)
+        derating (float, optional): Fraction of the rated voltage that may be used. Defaults to the
+            dielectric's value in DERATING.
+        dielectric (str, optional): Restrict the search to one dielectric (e.g. "C0G")
+        polarized (bool, optional): Restrict the search to polarized (True) or non polarized (False) parts
+
+    Returns:
+        Optional[Dict]: The catalog row or None if nothing qualifies
+    """
+    dielectrics = [dielectric] if dielectric else list(DERATING)
+    equals = {} if polarized is None else {"name": "CP" if polarized else "C"}
+    capacitance_range = (capacitance*(1-_CAPACITANCE_TOLERANCE), capacitance*(1+_CAPACITANCE_TOLERANCE))
+
+    best = None
+    for d in dielectrics:
+        rating = working_voltage / (derating if derating is not None else DERATING[d])
+        row = _CATALOG.cheapest(equals=dict(equals, dielectric=d),
+                                mins={"capacitance": capacitance_range[0], "voltage": rating},
+                                maxs={"capacitance": capacitance_range[1]})
+        if row is not None and (best is None or row["price"] < best["price"]):
+            best = row
+    return best
+
+def capacitor(capacitance: float, working_voltage: float, **kv) -> TrackedPart:
+    """
+    Creates the cheapest capacitor that qualifies (see select_capacitor for the arguments).
+
+    Returns:
+        TrackedPart: The capacitor with its footprint and sku
+    """
+    row = select_capacitor(capacitance, working_voltage, **kv)
+    assert row is not None, f"No capacitor of {capacitance}F for {working_voltage}V in the catalog ({kv})"
+    part = TrackedPart("Device", row["name"], value=row["value"], footprint=row["footprint"], sku=row["sku"])
+    return ratings_from_row(part, row)
@@ -0,0 +1,105 @@
+"""
+Closed-form (piecewise linear) DC models of some of the library's subcircuits, for screening
+designs before simulating them with SPICE. Every model takes NumPy arrays (or scalars) and
+broadcasts them, e.g. the input voltages as a column and the loads as a row evaluate the
+whole grid in one call:
+
+    v_in = np.linspace(-24, 24, 1000)[:, None]
+    i_load = np.linspace(0, 2, 100)[None, :]
+    rpp = reverse_polarity_protection_dc(v_in, i_load)
+"""
+
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+_RPP_R_DS_ON = 0.1          # Ω, the P channel MOSFETs of the catalog at V_GS=-4.5V are below that
+_RPP_V_GS_TH = 1.5          # V, below it only the body diode conducts
+_BODY_DIODE_VF = 0.7        # V
+
+# Dropout of the regulators low_dropout_power uses, modeled as v_0 + r*i: (v_0 (V), r (Ω))
+LDO_DROPOUT = {
+    5.0: (1.7, 0.9),        # LM78M05, 2V at 350mA
+    3.3: (0.95, 0.2),       # AMS1117-3.3, 1.1V at 800mA
+}
+
+_BRIDGE_VF = 1.0            # V, per diode of the ABS10
+_RECTIFIER_CAPACITANCE = 470E-6 + 1E-6
+
+
+def vdiv_resistors(ratio: float, rtot: float) -> Tuple[float, float]:
+    """
+    The resistors of vdiv: (input to output, output to ground).
+    """
+    return ratio*rtot/(ratio+1), rtot/(ratio+1)
+
+
+def vdiv_dc(v_in, ratio=2, rtot=1E+6, r_load=np.inf) -> np.ndarray:
+    """
+    Output voltage of vdiv, optionally loaded by r_load (Ω) to ground.
+    """
+    r1, r2 = vdiv_resistors(np.asarray(ratio, float), np.asarray(rtot, float))
+    r2_eff = 1/(1/r2 + 1/np.asarray(r_load, float))
+    return np.asarray(v_in, float)*r2_eff/(r1+r2_eff)
+
+
+class RppDC(NamedTuple):
+    v_out: np.ndarray       # V
+    p_loss: np.ndarray      # W, dissipated by the MOSFET (channel or body diode)
+
+
+def reverse_polarity_protection_dc(v_in, i_load, r_ds_on=_RPP_R_DS_ON, v_gs_th=_RPP_V_GS_TH,
+                                   v_f=_BODY_DIODE_VF) -> RppDC:
+    """
+    reverse_polarity_protection: a negative input is blocked, a small positive input only
+    passes through the body diode and above the gate threshold the channel conducts.
+    """
+    v_in, i_load = np.asarray(v_in, float), np.asarray(i_load, float)
+    channel = v_in >= v_gs_th
+    diode = (v_in > v_f) & ~channel
+    v_drop = np.where(channel, i_load*r_ds_on, v_f)
+    v_out = np.where(channel | diode, np.maximum(v_in - v_drop, 0.0), 0.0)
+    p_loss = np.where(channel | diode, v_drop*i_load, 0.0)
+    return RppDC(v_out, p_loss)
+
+
+class LdoDC(NamedTuple):
+    v_out: np.ndarray       # V
+    p_reg: np.ndarray       # W, dissipated by the regulator
+    in_regulation: np.ndarray
+
+
+def low_dropout_power_dc(v_in, i_load, vout: float, add_reverse_polarity_protection: bool = True) -> LdoDC:
+    """
+    low_dropout_power: the output follows the input minus the (current dependent) dropout until
+    the nominal output voltage is reached.
+    """
+    v_in, i_load = np.asarray(v_in, float), np.asarray(i_load, float)
+    if vout not in LDO_DROPOUT:
+        raise NotImplementedError("only 5V and 3V3 are implemented right now")
+    v_0, r_do = LDO_DROPOUT[vout]
+
+    v_reg_in = reverse_polarity_protection_dc(v_in, i_load).v_out if add_reverse_polarity_protection else v_in
+    headroom = v_reg_in - (v_0 + r_do*i_load)
+    v_out = np.clip(headroom, 0.0, vout)
+    p_reg = np.maximum(v_reg_in - v_out, 0.0)*i_load
+    return LdoDC(v_out, p_reg, headroom >= vout)
+
+
+class RectifierDC(NamedTuple):
+    v_peak: np.ndarray      # V, the capacitor's peak voltage
+    v_ripple: np.ndarray    # V, peak to peak
+    v_min: np.ndarray       # V
+    v_avg: np.ndarray       # V
+
+
+def full_bridge_rectifier_dc(v_ac_rms, i_load, freq=50.0, capacitance=_RECTIFIER_CAPACITANCE,
+                             v_f=_BRIDGE_VF) -> RectifierDC:
+    """
+    full_bridge_rectifier: the capacitors charge to the peak minus two diode drops and discharge
+    by the load current between the two peaks of every AC cycle.
+    """
+    v_ac_rms, i_load = np.asarray(v_ac_rms, float), np.asarray(i_load, float)
+    v_peak, i_load = np.broadcast_arrays(np.maximum(v_ac_rms*np.sqrt(2) - 2*v_f, 0.0), i_load)
+    v_ripple = np.minimum(i_load/(2*freq*capacitance), v_peak)
+    return RectifierDC(v_peak, v_ripple, v_peak - v_ripple, v_peak - v_ripple/2)
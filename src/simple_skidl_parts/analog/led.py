@@ -2,14 +2,19 @@
 Module defines usage of LEDs
 """
 
-from typing import Dict
+from typing import Dict, List, Sequence, Tuple
 from enum import Enum
+from functools import lru_cache
+import bisect
 
 from skidl import *
 
 from ..units import linear
 from ..parts_wrapper import TrackedPart
+from ..subcircuit_cache import memoize_subcircuit
+from ..circuit_context import current_circuit, subcircuit
 from .resistors import small_resistor as _R
+from .networks import copies
 
 class LedSingleColors(Enum):
     # No RGB LEDs since they have more pins
@@ -20,103 +25,100 @@ class LedSingleColors(Enum):
     BLUE = 4,
     WHITE = 5
 
+# (size in mm, footprint), sorted by size
+_FOOTPRINT_SIZES = [
+    (1.0, "LED_0402_1005Metric"),
+    (1.6, "LED_0603_1608Metric"),
+    (2.0, "LED_0805_2012Metric"),
+    (3.2, "LED_1206_3216Metric"),
+]
+_SIZES = [size for size, _ in _FOOTPRINT_SIZES]
+
+_LED_CATALOG = [
+    {"footprint": "LED_0603_1608Metric", "color": LedSingleColors.ORANGE, "value": "XL-0603QYC", "i_f": 0.02, "v_f": 2.1},
+    {"footprint": "LED_0603_1608Metric", "color": LedSingleColors.YELLOW, "value": "Y2C-CQ2R2L", "sku": "JLCPCB:C72038", "v_f": 1.7, "i_f": 0.02},
+    {"footprint": "LED_0603_1608Metric", "color": LedSingleColors.GREEN, "value": "C2288", "sku": "JLCPCB:C2288", "v_f": 2.9, "i_f": 0.02},
+    {"footprint": "LED_0603_1608Metric", "color": LedSingleColors.WHITE, "value": "KT-0603W", "sku": "JLCPCB:C2286", "v_f": 2.8, "i_f": 0.02},
+    {"footprint": "LED_0603_1608Metric", "color": LedSingleColors.BLUE, "value": "BHC-ZL1M2RY", "sku": "JLCPCB:C72041", "v_f": 2.5, "i_f": 0.025},
+    {"footprint": "LED_0603_1608Metric", "color": LedSingleColors.RED, "value": "KT-0603R", "sku": "JLCPCB:C2286", "v_f": 2.1, "i_f": 0.02},
+    {"footprint": "LED_0805_2012Metric", "color": LedSingleColors.YELLOW, "value": "17-21SUYC/TR8", "sku": "JLCPCB:C2296", "v_f": 2.1, "i_f": 0.02},
+    {"footprint": "LED_0805_2012Metric", "color": LedSingleColors.BLUE, "value": "XL-0805QBC", "sku": "JLCPCB:C2293", "v_f": 2.9, "i_f": 0.025},
+]
+_LED_BY_FOOTPRINT_COLOR = {(led["footprint"], led["color"]): led for led in _LED_CATALOG}
+
 def _get_closest_footprint(size: float) -> str:
     """Returns the closest footprint for the given size in mm. 
 
     Args:
         size (float): Approximate size in milimeters of the LED needed.
     """
-    sizes = {
-        1.0: "LED_0402_1005Metric",
-        1.6: "LED_0603_1608Metric",
-        2.0: "LED_0805_2012Metric",
-        3.2: "LED_1206_3216Metric"
-    }
-    best = 999.0
-    best_dist = 1.0
-    for k in sizes:
-        print(f"{k} {size} {abs(size-k)} {best}")
-        if abs(size-k) < best_dist:
-            best = k
-            best_dist = abs(size-k)
-
-
-    print(f"{k} {size} {best}")
-    return sizes[best]
+    i = bisect.bisect_left(_SIZES, size)
+    # On a tie, prefer the smaller footprint
+    best = min(_FOOTPRINT_SIZES[max(i-1, 0):i+1], key=lambda s: abs(size-s[0]))
+    assert abs(size-best[0]) < 1.0, f"No LED footprint close to {size}mm"
+    return best[1]
 
 def _get_led_value(footprint: str, color: LedSingleColors) -> Dict:
-    _led_by_footprint = {
-        "LED_0603_1608Metric": {
-            LedSingleColors.ORANGE: {
-                "value": "XL-0603QYC", 
-                "i_f": 0.02,
-                "v_f": 2.1
-            },
-            LedSingleColors.YELLOW: {
-                "value": "Y2C-CQ2R2L",
-                "sku": "JLCPCB:C72038",
-                "v_f": 1.7,
-                "i_f": 0.02
-            },
-            LedSingleColors.GREEN: {
-                "sku": "JLCPCB:C2288",
-                "value": "C2288",
-                "v_f": 2.9,
-                "i_f": 0.02
-            },
-            LedSingleColors.WHITE: {
-                "sku": "JLCPCB:C2286",
-                "value": "KT-0603W",  # JLCPCB number is: C2286,
-                "v_f": 2.8,
-                "i_f": 0.02
-            },
-            LedSingleColors.BLUE: {
-                "value": "BHC-ZL1M2RY",
-                "sku": "JLCPCB:C72041",
-                "v_f": 2.5,
-                "i_f": 0.025
-            },
-            LedSingleColors.RED: {
-                "sku": "JLCPCB:C2286",
-                "value": "KT-0603R",
-                "v_f": 2.1,
-                "i_f": 0.02
-            }
-        },
-        "LED_0805_2012Metric": {
-            LedSingleColors.YELLOW: {
-                "sku": "JLCPCB:C2296",
-                "value": "17-21SUYC/TR8",   # JLCPCB: C2296
-                "v_f": 2.1,
-                "i_f": 0.02
-            },
-            LedSingleColors.BLUE: {
-                "sku": "JLCPCB:C2293",
-                "value": "XL-0805QBC",   # JLCPCB: C2293
-                "v_f": 2.9,
-                "i_f": 0.025
-            }
-        }
-    }
-    return _led_by_footprint[footprint][color]
+    return _LED_BY_FOOTPRINT_COLOR[(footprint, color)]
+
+@lru_cache(maxsize=None)
+def _led_design(sig_voltage: float, color: LedSingleColors, size: float, led_attenuation: float) -> Tuple[str, Dict, float]:
+    """
+    Returns the footprint, the catalog entry and the current limiting resistance for an LED.
+    """
+    fp = _get_closest_footprint(size)
+    led_data = _get_led_value(fp, color)
+    i_led = led_attenuation * led_data["i_f"]
+    r_value = (sig_voltage - led_data["v_f"])/i_led
+    return fp, led_data, r_value
 
 
 @package
 def led_simple(signal: Net, gnd: Net, sig_voltage: float, color: LedSingleColors, size: float, led_attenuation: float = 1.0, ref_tmpl: str = "LED"):
-    fp = _get_closest_footprint(size)
-    led_data = _get_led_value(fp, color)
+    # skidl takes the package's interface from this signature, so the memoized body is separate
+    _led_simple(signal, gnd, sig_voltage, color, size, led_attenuation, ref_tmpl)
+
+@memoize_subcircuit
+def _led_simple(signal: Net, gnd: Net, sig_voltage: float, color: LedSingleColors, size: float, led_attenuation: float, ref_tmpl: str):
+    fp, led_data, r_value = _led_design(sig_voltage, color, size, led_attenuation)
     led = TrackedPart("Device", "LED_Small", value=led_data["value"], footprint=fp, sku=led_data.get("sku"), ref=ref_tmpl)
     print(f"LED sku: {led.sku} for {color}, {size}mm")
     led["A"] += signal
-    i_led = led_attenuation * led_data["i_f"]
-    led_f = led_data["v_f"]
 
-    r_value = (sig_voltage - led_f)/i_led
-    
     r = _R(r_value)
     r[1] += led["K"]
     r[2] += gnd
 
+@subcircuit
+def led_bank(signals: Sequence[Net], gnd: Net, sig_voltage: float, color: LedSingleColors, size: float, led_attenuation: float = 1.0, ref_tmpl: str = "LED") -> List[Tuple[Part, Part]]:
+    """
+    Creates one indicator LED (with its current limiting resistor) per signal. All the LEDs are the
+    same, so the parts are resolved once and copied.
+
+    Args:
+        signals (Sequence[Net]): The nets (or pins) driving the LEDs
+        gnd (Net): Ground net
+        sig_voltage (float): The voltage of the signals
+        color (LedSingleColors): Color of the LEDs
+        size (float): Approximate size of the LEDs (mm)
+        led_attenuation (float, optional): Fraction of the nominal LED current to use. Defaults to 1.0.
+        ref_tmpl (str, optional): Reference of the LEDs. Defaults to "LED".
+
+    Returns:
+        List[Tuple[Part, Part]]: The (LED, resistor) pairs in the order of the signals
+    """
+    fp, led_data, r_value = _led_design(sig_voltage, color, size, led_attenuation)
+    leds = copies(TrackedPart("Device", "LED_Small", value=led_data["value"], footprint=fp, sku=led_data.get("sku"), ref=ref_tmpl), len(signals))
+    for led in leds[1:]:
+        led.ref = ref_tmpl  # Copies get automatic refs
+    resistors = copies(_R(r_value), len(signals))
+
+    for signal, led, r in zip(signals, leds, resistors):
+        led["A"] += signal
+        r[1] += led["K"]
+    gnd += [r[2] for r in resistors]
+    return list(zip(leds, resistors))
+
 @subcircuit
 def led_with_bjt(signal: Net, gnd: Net, vcc: Net, vcc_voltage: float, color: LedSingleColors, size: float):
     """
@@ -137,6 +139,6 @@ def led_with_bjt(signal: Net, gnd: Net, vcc: Net, vcc_voltage: float, color: Led
     r[2] & bjt["B"]
 
     vcc += bjt["C"]
-    led = led_simple(sig_voltage=vcc_voltage, color=color, size=size)
+    led = led_simple(sig_voltage=vcc_voltage, color=color, size=size, circuit=current_circuit())
     led.signal += bjt["E"]
     led.gnd += gnd
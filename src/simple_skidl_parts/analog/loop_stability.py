@@ -0,0 +1,120 @@
+"""
+Small signal loop analysis of the TPS54331 (peak current mode) buck converter with its type II
+compensation network. All the functions accept NumPy arrays (or scalars) for the design
+parameters and broadcast them, so a whole design sweep is analyzed in one call.
+
+The model follows the datasheet's compensation procedure: the power stage is a transconductance
+(gm_ps) into the output load and capacitor, and the error amplifier is a transconductance (gm_ea)
+into its output resistance in parallel with the compensation network.
+"""
+
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+V_REF = 0.8         # V
+GM_PS = 12.0        # A/V, power stage transconductance
+A_EA = 800.0        # V/V, error amplifier DC gain
+R_OA = 8E+6         # Ω, error amplifier output resistance
+F_SW = 5.7E+5       # Hz
+
+def default_frequencies(points: int = 400) -> np.ndarray:
+    return np.logspace(1, np.log10(F_SW/2), points)
+
+
+class LoopMargins(NamedTuple):
+    crossover: np.ndarray       # Hz (nan if the loop gain never crosses 0dB)
+    phase_margin: np.ndarray    # degrees (nan without a crossover)
+    gain_margin: np.ndarray     # dB (inf if the phase never reaches -180°)
+
+
+def tps54331_compensation(v_out, i_out, c_out, f_co: float = 1E+4, r_esr: float = 50E-3,
+                          phase_margin: float = np.pi/3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculates the ideal compensation network (R_z, C_z, C_p) for a crossover frequency and
+    phase margin.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: R_z (Ω), C_z (F) and C_p (F)
+    """
+    v_out, i_out, c_out = np.asarray(v_out, float), np.asarray(i_out, float), np.asarray(c_out, float)
+    phase_loss = np.arctan(2*np.pi*f_co*r_esr*c_out) - np.arctan(2*np.pi*f_co*(v_out/i_out)*c_out)
+    phase_boost = (phase_margin-np.pi/2)-phase_loss
+    r_z = 2*np.pi*f_co*v_out*c_out*R_OA/(GM_PS*A_EA*V_REF)
+    k = np.tan(phase_boost/2+np.pi/4)
+    c_z = 1/(2*np.pi*(f_co/k)*r_z)
+    c_p = 1/(2*np.pi*(f_co*k)*r_z)
+    return r_z, c_z, c_p
+
+
+def tps54331_loop_gain(freqs, v_out, i_out, c_out, r_z, c_z, c_p, r_esr=50E-3) -> np.ndarray:
+    """
+    Evaluates the loop gain T(j2πf). The design parameters are broadcast against each other and
+    the frequencies are added as the last axis.
+
+    Returns:
+        np.ndarray: Complex loop gain with shape broadcast(params) + (len(freqs),)
+    """
+    s = 2j*np.pi*np.asarray(freqs, float)
+    v_out, i_out, c_out, r_z, c_z, c_p, r_esr = (np.asarray(x, float)[..., None]
+        for x in (v_out, i_out, c_out, r_z, c_z, c_p, r_esr))
+
+    r_load = v_out/i_out
+    z_cap = r_esr + 1/(s*c_out)
+    z_out = r_load*z_cap/(r_load+z_cap)
+    z_comp = 1/(1/R_OA + s*c_p + 1/(r_z + 1/(s*c_z)))
+
+    return GM_PS*z_out * (V_REF/v_out) * (A_EA/R_OA)*z_comp
+
+
+def loop_margins(freqs, loop) -> LoopMargins:
+    """
+    Finds the crossover frequency, phase margin and gain margin of loop gains evaluated over
+    increasing frequencies (last axis). Values between grid points are interpolated over log(f).
+    """
+    log_f = np.log10(np.asarray(freqs, float))
+    gain = 20*np.log10(np.abs(loop))
+    phase = np.degrees(np.unwrap(np.angle(loop), axis=-1))
+
+    def _first_crossing(values, threshold):
+        below = values < threshold
+        idx = np.argmax(below, axis=-1)
+        valid = below.any(axis=-1) & (idx > 0)
+        idx = np.where(valid, idx, 1)
+        v0 = np.take_along_axis(values, (idx-1)[..., None], -1)[..., 0]
+        v1 = np.take_along_axis(values, idx[..., None], -1)[..., 0]
+        t = (threshold-v0)/(v1-v0)
+        return valid, idx, t
+
+    valid, idx, t = _first_crossing(gain, 0.0)
+    f_c = 10**(log_f[idx-1] + t*(log_f[idx]-log_f[idx-1]))
+    p0 = np.take_along_axis(phase, (idx-1)[..., None], -1)[..., 0]
+    p1 = np.take_along_axis(phase, idx[..., None], -1)[..., 0]
+    crossover = np.where(valid, f_c, np.nan)
+    phase_margin = np.where(valid, 180 + p0 + t*(p1-p0), np.nan)
+
+    valid_180, idx, t = _first_crossing(phase, -180.0)
+    g0 = np.take_along_axis(gain, (idx-1)[..., None], -1)[..., 0]
+    g1 = np.take_along_axis(gain, idx[..., None], -1)[..., 0]
+    gain_margin = np.where(valid_180, -(g0 + t*(g1-g0)), np.inf)
+
+    return LoopMargins(crossover, phase_margin, gain_margin)
+
+
+def analyze_tps54331(v_out, i_out, c_out, r_z, c_z, c_p, r_esr=50E-3, freqs=None) -> LoopMargins:
+    """
+    Loop margins of one design or of a whole sweep (all arguments broadcast together).
+
+    Args:
+        v_out: Output voltage (V)
+        i_out: Maximum output current (A)
+        c_out: Total output capacitance (F)
+        r_z, c_z, c_p: The compensation network (Ω, F, F)
+        r_esr: ESR of the output capacitance (Ω)
+        freqs (optional): Frequency grid, defaults to 10Hz up to half the switching frequency
+
+    Returns:
+        LoopMargins: crossover (Hz), phase margin (°) and gain margin (dB)
+    """
+    freqs = default_frequencies() if freqs is None else freqs
+    return loop_margins(freqs, tps54331_loop_gain(freqs, v_out, i_out, c_out, r_z, c_z, c_p, r_esr))
@@ -0,0 +1,73 @@
+"""
+Builders for banks of two terminal parts (e.g. decoupling and bulk capacitors) connected in
+parallel or in series between two nets. The parts are connected directly to the nets, without
+building intermediate skidl networks, so the work grows linearly with the number of parts.
+"""
+
+from typing import List, Sequence
+
+from skidl import *
+
+from ..circuit_context import current_circuit
+
+def copies(part: Part, count: int) -> List[Part]:
+    """
+    Returns the given part followed by count-1 copies of it (in the same circuit). The copies keep
+    the part's value, footprint and sku so these are only resolved once for the whole bank.
+
+    Args:
+        part (Part): The part to replicate
+        count (int): The total number of parts required
+
+    Returns:
+        List[Part]: count parts (the first is the given one)
+    """
+    if count <= 1:
+        return [part][:count]
+    extra = part.copy(num_copies=count-1, circuit=part.circuit)
+    return [part] + (extra if isinstance(extra, list) else [extra])
+
+def parallel(a: Net, b: Net, parts: Sequence[Part]) -> List[Part]:
+    """
+    Connects all the parts between a and b: pin 1 to a (the + of polarized parts), pin 2 to b.
+
+    Returns:
+        List[Part]: The parts
+    """
+    parts = list(parts)
+    a += [p[1] for p in parts]
+    b += [p[2] for p in parts]
+    return parts
+
+def series(a: Net, b: Net, parts: Sequence[Part]) -> List[Net]:
+    """
+    Chains the parts from a to b (pin 1 towards a).
+
+    Returns:
+        List[Net]: The nets created between consecutive parts
+    """
+    parts = list(parts)
+    if not parts:
+        a += b
+        return []
+    circ = current_circuit()
+    nets = [Net(circuit=circ) for _ in parts[1:]]
+    for n, prev, nxt in zip(nets, parts, parts[1:]):
+        n += prev[2], nxt[1]
+    a += parts[0][1]
+    b += parts[-1][2]
+    return nets
+
+def parallel_bank(a: Net, b: Net, part: Part, count: int) -> List[Part]:
+    """
+    Places count copies of part in parallel between a and b (e.g. a bank of decoupling caps).
+    """
+    return parallel(a, b, copies(part, count))
+
+def series_chain(a: Net, b: Net, part: Part, count: int) -> List[Part]:
+    """
+    Places count copies of part in series between a and b.
+    """
+    parts = copies(part, count)
+    series(a, b, parts)
+    return parts
@@ -5,46 +5,89 @@ This module defines power circuits
 from audioop import reverse
 import math
 from re import A
-from typing import Tuple
-from functools import reduce
+from typing import Dict, Tuple
 from pathlib import Path
 
 from skidl import *
+from rkm_codes import to_rkm
 
 from ..units import linear
-from ..parts_wrapper import TrackedPart
+from ..parts_wrapper import TrackedPart, CachedPart, has_suggested_part
+from ..subcircuit_cache import memoize_subcircuit
+from ..drc import ratings_from_row, set_ratings
+from ..circuit_context import current_circuit, subcircuit
 from .power_data import get_lm2596_inductor_value
-from .resistors import small_resistor as R
+from . import loop_stability
+from . import active_parts
+from .capacitors import capacitor, select_capacitor
+from .resistors import small_resistor as R, resistor
+from .networks import copies, parallel
 
-from .analog_parts_lib import SSP_LIB_PATH
+from .analog_parts_lib import get_ssp_lib
 
 
 __all__ = ["dc_motor_on_off", "low_dropout_power", "buck_step_down_exact_input", "full_bridge_rectifier"]
 
+# Minimal phase margin (degrees) of the compensated TPS54331 loop before warning.
+_MIN_PHASE_MARGIN = 45
+
+# The TPS54331 COMP pin (and its compensation capacitors) stays below this voltage (V).
+_COMP_MAX_VOLTAGE = 3.0
+
+# SOT-23 MOSFETs are only used below this current (A), they can't dissipate much
+_SOT23_MAX_CURRENT = 4.0
+
+# Input and output capacitors of the linear regulators (see their datasheets)
+_LDO_CAPS = {
+    "LM78M05_TO252": ("330p", "100p"),
+    "AMS1117-3.3": ("22u", "10u"),
+}
+
+def _part_from_row(row: Dict) -> Part:
+    """
+    Creates a part from a row of the active parts database (tracked if the row has an sku).
+    """
+    if row.get("sku"):
+        part = TrackedPart(row["lib"], row["name"], value=row["value"], footprint=row["footprint"], sku=row["sku"])
+    else:
+        part = CachedPart(row["lib"], row["name"], value=row["value"], footprint=row["footprint"])
+    return ratings_from_row(part, row)
+
+def _small_capacitor(capacitance: float, working_voltage: float) -> Part:
+    """
+    Creates a ceramic capacitor of the closest E24 value, from the capacitor catalog if it has one,
+    then from the suggested parts list and otherwise untracked (0805, without an SKU).
+    """
+    capacitance = linear.e_series_number(capacitance, 24)
+    if select_capacitor(capacitance, working_voltage, polarized=False):
+        return capacitor(capacitance, working_voltage, polarized=False)
+    value = linear.get_value_name(capacitance)
+    if has_suggested_part("C", value):
+        return TrackedPart("Device", "C", value=value)
+    return CachedPart("Device", "C", value=value, footprint="C_0805_2012Metric")
+
 def _get_logic_mosfet(v_signal_min: float, current_max: float) -> Part:
     """
     Chooses the correct logic MOSFET for the application given a minimal signal and maximum
     working current.
 
     Args:
-        v_signal_min (float): Minimum required signal voltage (Vgs(th) might be a good start)
+        v_signal_min (float): Minimum required signal voltage (Vgs(th) might be a good start). None
+            of the MOSFETs is fully on below 2.5V.
         current_max (float): The maximum current requirement for that part to withstand
 
     Returns:
         Part: A skidl part with the correct MOSFET
     """
-    # For the moment, only two mosfets can be chosen. One for 3.3V and one for 5V.
     assert current_max <= 30
+    if v_signal_min < 2.5:
+        raise NotImplementedError("Please add a proper MOSFET (signals below 2.5V are not supported)")
 
-    if v_signal_min >= 4.5 and current_max >= 4:
-        return Part("Transistor_FET", "IRLZ44N", footprint="TO-220-3_Horizontal_TabDown", value="IRLZ44N")
-    elif current_max >= 4:
-        return Part("Transistor_FET", "IRLIZ44N", footprint="TO-220-3_Horizontal_TabDown", value="IRLIZ44N")
-    
-    if v_signal_min >= 2.5:
-        return TrackedPart("Transistor_FET", "AO3400A", sku="JLCPCB:C20917", footprint="SOT-23")
-    else:
+    packages = None if current_max < _SOT23_MAX_CURRENT else ("TO-220",)
+    row = active_parts.select_mosfet("N", v_gate=v_signal_min, current=current_max, packages=packages)
+    if row is None:
         raise NotImplementedError("Please add a proper MOSFET")
+    return _part_from_row(row)
 
 @subcircuit
 def dc_motor_on_off(gate: Net, vin: Net, gnd: Net, v_signal_min: float = 5, motor_current_max: float = 10) -> None:
@@ -56,7 +99,7 @@ def dc_motor_on_off(gate: Net, vin: Net, gnd: Net, v_signal_min: float = 5, moto
         gate (Net): The control signal - on is high.
         vin (Net): Connect this net to the motor's negative lead. The other side to the motor's power source.
         gnd (Net): Ground net for both motor and signal
-        v_signal_min (float, optional): Defaults to 5 (V).
+        v_signal_min (float, optional): At least 2.5. Defaults to 5 (V).
         motor_current_max (float, optional): Defaults to 10(A).
     """
     mosfet = _get_logic_mosfet(v_signal_min, motor_current_max)
@@ -92,11 +135,13 @@ def full_bridge_rectifier(vac1: Net, vac2: Net, dc_out_p:Net, dc_out_m:Net, max_
         max_voltage (float): Maximum expected voltage in input(V)
     """
 
-    db = TrackedPart("Diode_Bridge", "ABS10", footprint="Diode_SMD:Diode_Bridge_Diotec_ABS")
-    dcap1 = TrackedPart("Device", "CP", value="470uF", footprint="Capacitor_SMD:CP_Elec_16x17.5", sku="JLCPCB:C178551")  # Requires 50V - JLCPCB  #C178551
-    dcap2 = TrackedPart("Device", "C", value="1uF", footprint="Capacitor_SMD:C_0805_2012Metric", sku="JLCPCB:C28323")  # Requires 50V - JLCPCB  #C28323
+    db = set_ratings(TrackedPart("Diode_Bridge", "ABS10", footprint="Diode_SMD:Diode_Bridge_Diotec_ABS"),
+        voltage=1000, current=4.0)
+    # The caps see the peak voltage. No derating, the caps used to be chosen for a 50V limit.
+    v_peak = max_voltage*math.sqrt(2)
+    dcap1 = capacitor(470E-6, v_peak, derating=1.0, polarized=True)
+    dcap2 = capacitor(1E-6, v_peak, derating=1.0, polarized=False)
     
-    assert max_voltage*math.sqrt(2) <= 50  # 50 since the caps are rated 50V.
     assert max_current <= 4.0
 
     vac1 += db[3]
@@ -140,16 +185,17 @@ def buck_step_down_exact_input(vin: Net, out: Net, gnd: Net, output_voltage: flo
         e_t = (1000/150)*(input_voltage-output_voltage-V_SAT)*(output_voltage+V_D)/(input_voltage-V_SAT+V_D)
         return get_lm2596_inductor_value(max_current, e_t)
 
-    def get_ff_out_capacitance() -> Tuple[str, str]:
+    def get_ff_out_capacitance() -> Tuple[Tuple[float, float], str]:
+        # (output capacitance (F), output capacitor's voltage rating (V)), feed forward capacitor
         CAP_DICT = {
-            2:("470u 4V", "33n"),
-            4:("390u 6.3V", "10n"),
-            6:("330u 10V", "3n3"),
-            9:("180u 16V", "1n5"),
-            12:("180u 16V", "1n"),
-            15:("120u 16V", "680p"),
-            24:("33u 25V", "220p"),
-            28:("15u 50V", "220p")
+            2:((470E-6, 4), "33n"),
+            4:((390E-6, 6.3), "10n"),
+            6:((330E-6, 10), "3n3"),
+            9:((180E-6, 16), "1n5"),
+            12:((180E-6, 16), "1n"),
+            15:((120E-6, 16), "680p"),
+            24:((33E-6, 25), "220p"),
+            28:((15E-6, 50), "220p")
         }
         volt = 1
         for k,v in CAP_DICT.items():
@@ -164,31 +210,33 @@ def buck_step_down_exact_input(vin: Net, out: Net, gnd: Net, output_voltage: flo
     resistance_r1 = 1000 # Should be between 240Ohm and 1.5K according to datasheet
     regulator = TrackedPart("Regulator_Switching", "LM2596T-ADJ", value="LM2596T-ADJ", sku="JLCPCB:C29781",
             footprint="Package_TO_SOT_SMD:TO-263-5_TabPin3") # JLCPCB #C29781
-    c_in = TrackedPart("Device", "CP", value="470uF", footprint="Capacitor_SMD:CP_Elec_16x17.5", sku="JLCPCB:C178551")  # Requires 50V - JLCPCB  #C178551
+    c_in = capacitor(470E-6, input_voltage, polarized=True)
 
-    if max_current*1.25 <= 1.0 or input_voltage*1.25 <= 40.0:
-        d1 = TrackedPart("Device", "D_Schottky", value="B5819W", footprint="Diode_SMD:D_SOD-123", sku="JLCPCB:C8598")
-        v_d1 = 0.6
-    else:
-        #C35722
-        d1 = TrackedPart("Device", "D_Schottky", value="SS36-E3/57T", footprint="Diode_SMD:D_SMA", sku="JLCPCB:C35722")
-        v_d1 = 0.75
+    d1_row = active_parts.select_diode("schottky", current=max_current*1.25, voltage=input_voltage*1.25)
+    if d1_row is None:
+        raise NotImplementedError("Please add a Schottky diode for this current and voltage")
+    d1 = _part_from_row(d1_row)
+    v_d1 = d1_row["vf"]
 
 
     # Some values:
     # for 100uH 1.5A -> C167258 @ L_12x12mm_H6mm
-    l1 = Part("Device", "L", value=get_inductance(v_d1), footprint="Inductor_SMD:L_10.4x10.4_H4.8") 
+    l1 = CachedPart("Device", "L", value=get_inductance(v_d1), footprint="Inductor_SMD:L_10.4x10.4_H4.8") 
     r1 = R(resistance_r1, 48)  # Requires 1% accuracy or better, recommended metal film res. Locate near FB pin
-    capacitance_out, capacitance_ff = get_ff_out_capacitance()
+    (capacitance_out, rating_out), capacitance_ff = get_ff_out_capacitance()
     c_ff = TrackedPart("Device", "C", value=capacitance_ff)
-    c_out = TrackedPart("Device", "CP", value=capacitance_out)
+    if select_capacitor(capacitance_out, output_voltage, polarized=True):
+        c_out = capacitor(capacitance_out, output_voltage, polarized=True)
+    else:
+        c_out = TrackedPart("Device", "CP", value=f"{to_rkm(capacitance_out).replace('µ', 'u')} {rating_out}V")
 
     VREF = 1.23   # Volt, see datasheet page 9.
     resistance_r2 = resistance_r1 * (output_voltage/VREF - 1.0)
     r2 = R(resistance_r2, 48)  # Requires at least 1% accuracy
     
     # connect the parts:
-    vdiv = Net("FB")
+    circ = current_circuit()
+    vdiv = Net("FB", circuit=circ)
 
     r1[2] & vdiv 
     vdiv | r2[1]
@@ -203,7 +251,7 @@ def buck_step_down_exact_input(vin: Net, out: Net, gnd: Net, output_voltage: flo
     l1[1] | regulator["OUT"] | d1[1] 
 
     if input_voltage >= 4 and add_rpp:
-        rpp = reverse_polarity_protection(input_voltage=input_voltage)
+        rpp = reverse_polarity_protection(input_voltage=input_voltage, circuit=circ)
         rpp.vin += vin
         unreg_inp = rpp.vout
         rpp.gnd += gnd
@@ -211,7 +259,7 @@ def buck_step_down_exact_input(vin: Net, out: Net, gnd: Net, output_voltage: flo
         unreg_inp = vin
 
     unreg_inp.drive = vin.drive
-    to_vin = Net()
+    to_vin = Net(circuit=circ)
     to_vin.drive = POWER
     c_in[1] | unreg_inp | to_vin
     to_vin & regulator["VIN"]
@@ -230,11 +278,10 @@ def reverse_polarity_protection(vin: Net, gnd: Net, vout: Net, input_voltage: fl
         vout (Net): Output net (protected + polarity)
         input_voltage (float): The voltage required for normal operation
     """
-    if max_current >= 4.0 or input_voltage >= 30:
-        pfet = Part("Transistor_FET", "IRF9540N", value="IRF9540N", footprint="TO-220-3_Horizontal_TabDown")
-    else:
-        # JLCPCB part #C15127
-        pfet = TrackedPart("Transistor_FET", "AO3401A", value="AO3401A", footprint="SOT-23", sku="JLCPCB:C15127")
+    pfet_row = active_parts.select_mosfet("P", current=max_current, voltage=input_voltage, strict=True)
+    if pfet_row is None:
+        raise NotImplementedError("Please add a P channel MOSFET for this current and voltage")
+    pfet = _part_from_row(pfet_row)
 
     if input_voltage >= 10:  # 10V for the max gate voltage of the mosfet (AO3401A) and 12V for the IRF9540N
         # Add a zenner diode to clamp the voltage (GS) to <= 5.6V (which is fully ON for both FETs)
@@ -265,31 +312,26 @@ def low_dropout_power(vin: Net, out: Net, gnd: Net, vin_max: float, vout: float,
         vin (Net): Power comming in
         out (Net): Connect your device to this net
         gnd (Net): Ground net (common)/D
-        vin_max (float): The maximum voltage allowed as input to this power unit
-        vout (float): The requested output voltage
-        max_current (float): Maximum allowed current
+        vin_max (float): The maximum voltage allowed as input to this power unit (up to 35V for 5V
+            and 15V for 3.3V)
+        vout (float): The requested output voltage (5 or 3.3)
+        max_current (float): Maximum allowed current (up to 0.5A for 5V and 1A for 3.3V)
         add_reverse_polarity_protection (bool): Add a reverse polarity protection diode
 
     Returns:
         Part: The subcircuit of this power unit
     """
-    assert max_current <= 1, "atm not implemented"
-    
-    if vout == 5.0:
-        reg = TrackedPart("Regulator_Linear", "LM78M05_TO252", footprint="TO-252-2", sku="JLCPCB:C55509")  # JLCPCB part #C55509
-        C1 = TrackedPart("Device", "C", value = "330p")
-        C2 = TrackedPart("Device", "C", value = "100p")
-    elif vout == 3.3:
-        reg = TrackedPart("Regulator_Linear", "AMS1117-3.3", footprint="SOT-223", sku="JLCPCB:C6186")  # JLCPCB part #C55509
-        C1 = TrackedPart("Device", "C", value = "22u")
-        C2 = TrackedPart("Device", "C", value = "10u")
-    else:
-        raise NotImplementedError("only 5V and 3V3 are implemented right now")
+    reg_row = active_parts.select_regulator("linear", vout=vout, vin=vin_max, current=max_current)
+    if reg_row is None:
+        raise NotImplementedError("only 5V (up to 0.5A and 35V in) and 3V3 (up to 1A and 15V in) are implemented right now")
+    reg = _part_from_row(reg_row)
+    C1, C2 = (TrackedPart("Device", "C", value=v) for v in _LDO_CAPS[reg_row["name"]])
 
 
     if add_reverse_polarity_protection:
-        rpol = reverse_polarity_protection(input_voltage=vin_max, max_current=max_current)
-        n = Net.get(vin.name)
+        circ = current_circuit()
+        rpol = reverse_polarity_protection(input_voltage=vin_max, max_current=max_current, circuit=circ)
+        n = Net.get(vin.name, circuit=circ)
         n.drive=POWER
         rpol.vin += vin
         rpol.vout += n
@@ -328,6 +370,13 @@ def _rc_snub_values(ac_voltage_max: float, ac_freq: float=50.0, max_current_ac:
 def optocoupled_triac_switch(ac1: Net, ac2: Net, signal: Net, gnd: Net, load1: Net, load2: Net,
             ac_voltage_max: float, sig_voltage: float=2.7, ac_freq: float=50.0, 
             max_current_ac: float = 1.5):
+    # skidl takes the package's interface from this signature, so the memoized body is separate
+    _optocoupled_triac_switch(ac1, ac2, signal, gnd, load1, load2, ac_voltage_max, sig_voltage,
+                              ac_freq, max_current_ac)
+
+@memoize_subcircuit
+def _optocoupled_triac_switch(ac1: Net, ac2: Net, signal: Net, gnd: Net, load1: Net, load2: Net,
+            ac_voltage_max: float, sig_voltage: float, ac_freq: float, max_current_ac: float):
 
     # Some more info here:
     # https://slideplayer.com/slide/17171190/
@@ -335,22 +384,22 @@ def optocoupled_triac_switch(ac1: Net, ac2: Net, signal: Net, gnd: Net, load1: N
     # https://learnabout-electronics.org/Semiconductors/thyristors_66.php
 
     snub_res, snub_cap = _rc_snub_values(ac_voltage_max, ac_freq, max_current_ac)
-    r_snub = R(snub_res)
-    c_snub = TrackedPart("Device", "C", value=linear.get_value_name(snub_cap))
+    r_snub = resistor(snub_res)
+    c_snub = _small_capacitor(snub_cap, math.sqrt(2)*ac_voltage_max)
 
-    triac = Part("Triac_Thyristor", "BT138-600", footprint="TO-220-3_Vertical")
+    triac = CachedPart("Triac_Thyristor", "BT138-600", footprint="TO-220-3_Vertical")
     assert max_current_ac <= 12.0, "Current above 12A is not supported currently for this type of switching"
 
     load2.drive = POWER
     load2 += ac2
 
-    opto = Part("Relay_SolidState", "MOC3020M", footprint="DIP-6_W7.62mm_LongPads")
+    opto = CachedPart("Relay_SolidState", "MOC3020M", footprint="DIP-6_W7.62mm_LongPads")
     v_f_opto = 1.4     # Given in datasheet of VO3020 by Vishay (which I use) - 1.5 max. 
     i_f_opto = 0.02    # Although it can be reduced, this is fine.
 
     r_val = (sig_voltage - v_f_opto)/i_f_opto
 
-    cur_lim_r = R(r_val)
+    cur_lim_r = resistor(r_val)
     opto["1"] += cur_lim_r[1]
     cur_lim_r[2] += signal
     opto["2"] += gnd
@@ -359,13 +408,13 @@ def optocoupled_triac_switch(ac1: Net, ac2: Net, signal: Net, gnd: Net, load1: N
     # is 100mA, so we need a resistor to prevent maximum current and allow minimal holding current
     # The surge that r_surge2 is protecting against is the one from the snubber cap. 
     
-    r_surge1 = R((ac_voltage_max*2)/0.9)
-    r_surge2 = R(ac_voltage_max/0.1)
+    r_surge1 = resistor((ac_voltage_max*2)/0.9)
+    r_surge2 = resistor(ac_voltage_max/0.1)
 
     triac["G"] += opto["4"]
     opto["4"] += r_surge2[1]
 
-    out1 = Net("AC-OUT")
+    out1 = Net("AC-OUT", circuit=current_circuit())
     out1.drive = POWER
     ac1.drive = POWER
 
@@ -381,13 +430,13 @@ def optocoupled_triac_switch(ac1: Net, ac2: Net, signal: Net, gnd: Net, load1: N
     c_snub[2] & out1
 
     # Using a through hole for this part for now
-    fuse = Part("Device", "Polyfuse", value=max_current_ac, footprint="Fuse_Bourns_MF-RG300")
+    fuse = CachedPart("Device", "Polyfuse", value=max_current_ac, footprint="Fuse_Bourns_MF-RG300")
     out1 += fuse[1]
     load1 += fuse[2]
     load1.drive = POWER
 
     # Lastly, protect the opto-triac from surges. The much larger triac should be fine with these.
-    tvs = Part("Device", "D_TVS_ALT", value=f"{int(ac_voltage_max*2)}", footprint="Diode_THT:D_DO-15_P3.81mm_Vertical_KathodeUp")
+    tvs = CachedPart("Device", "D_TVS_ALT", value=f"{int(ac_voltage_max*2)}", footprint="Diode_THT:D_DO-15_P3.81mm_Vertical_KathodeUp")
     tvs[1] += opto[4]
     tvs[2] += opto[6]
 
@@ -408,8 +457,9 @@ def buck_step_down_regular(vin: Net, out: Net, gnd: Net, output_voltage: float =
         rpp: add Reverse input polarity protection?
     """
     if rpp:
-        rpol = reverse_polarity_protection(input_voltage=input_vmax, max_current=max_current)
-        inp = Net("12VP")
+        circ = current_circuit()
+        rpol = reverse_polarity_protection(input_voltage=input_vmax, max_current=max_current, circuit=circ)
+        inp = Net("12VP", circuit=circ)
         inp.drive=POWER
         rpol.vin += vin
         rpol.vout += inp
@@ -421,7 +471,7 @@ def buck_step_down_regular(vin: Net, out: Net, gnd: Net, output_voltage: float =
     ci3, c_boot, c_slow_start = [TrackedPart("Device", "C", value=v) for v in ["10p", "100p", "10p"]]
 
     NUM_CAP_DECOUPLE = 6  # Ain't no kill like overkill...
-    c_input_dec = reduce(lambda x,y: x | y, (TrackedPart("Device", "C", value="10u") for _ in range(NUM_CAP_DECOUPLE)))
+    c_input_dec = copies(TrackedPart("Device", "C", value="10u"), NUM_CAP_DECOUPLE)
 
     r_value = 10000
     v_ref = 0.8  # from datasheet
@@ -436,42 +486,39 @@ def buck_step_down_regular(vin: Net, out: Net, gnd: Net, output_voltage: float =
         
     print(f"Minimum Inductance: {l_min*1000*1000}𝜇H, Inductor RMS current: {i_ind_rms}")
 
-    l = Part("Device", "L", value=linear.get_value_name(l_min*1.2), footprint="L_12x12mm_H6mm")
+    l = CachedPart("Device", "L", value=linear.get_value_name(l_min*1.2), footprint="L_12x12mm_H6mm")
     
     f_co = 1E+4
     c_out_value = 1/(2*math.pi*(output_voltage/max_current)*f_co)
     print(f"C_out: {c_out_value*1E+6}𝜇F")
     
-    c_o_1 = Part("Device", "CP", value=linear.get_value_name(c_out_value*2), footprint="CP_Radial_D5.0mm_P2.50mm")
-    c_o_2 = Part("Device", "CP", value=linear.get_value_name(c_out_value*2), footprint="CP_Radial_D5.0mm_P2.50mm")
+    c_o_1 = CachedPart("Device", "CP", value=linear.get_value_name(c_out_value*2), footprint="CP_Radial_D5.0mm_P2.50mm")
+    c_o_2 = CachedPart("Device", "CP", value=linear.get_value_name(c_out_value*2), footprint="CP_Radial_D5.0mm_P2.50mm")
 
     # Output Compensation
-    v_gg = 800
-    g_dc = v_gg*v_ref/output_voltage
+    g_dc = loop_stability.A_EA*v_ref/output_voltage
     r_esr = 50E-3 #Ω
-    PHASE_MARGIN = math.pi/3
 
     output_capacitance = linear.e_series_number(c_out_value*4, 24) # since we have 2 caps of 2 times c_out_value
-    c_out_dec = reduce(lambda x,y: x | y, (
-        TrackedPart("Device", "C", value=linear.get_value_name(c_out_value)) if c_out_value < 1E-5 else Part("Device", "CP", value=linear.get_value_name(c_out_value), footprint="CP_Radial_D5.0mm_P2.50mm") 
-            for _ in range(NUM_CAP_DECOUPLE)))
-
-    phase_loss = math.atan(2*math.pi*f_co*r_esr*output_capacitance) - \
-            math.atan(2*math.pi*f_co*(output_voltage/max_current)*output_capacitance)
-    phase_boost = (PHASE_MARGIN-math.pi/2)-phase_loss
-    r_oa = 8E+6 #Ω
-    r_z_val = 2*math.pi*f_co*output_voltage*output_capacitance*r_oa/(12*v_gg*v_ref)
-    k = math.tan(phase_boost/2+math.pi/4)
-    f_z1 = f_co/k
-    f_p1 = f_co*k
-    print(f"Calculated F_z1: {f_z1} Hz F_p1: {f_p1} Hz k: {k} Phase loss: {phase_loss} Phase boost: {phase_boost} Output Capacitance: {output_capacitance*1E+6}𝜇F")
-    print(f"Calculated gain: {g_dc}")
-    c_z_val = 1/(2*math.pi*f_z1*r_z_val)
-    c_p_val = 1/(2*math.pi*f_p1*r_z_val)
+    c_out_dec = copies(
+        _small_capacitor(c_out_value, output_voltage) if c_out_value < 1E-5 else CachedPart("Device", "CP", value=linear.get_value_name(c_out_value), footprint="CP_Radial_D5.0mm_P2.50mm"),
+        NUM_CAP_DECOUPLE)
+
+    r_z_val, c_z_val, c_p_val = (float(v) for v in loop_stability.tps54331_compensation(
+        output_voltage, max_current, output_capacitance, f_co=f_co, r_esr=r_esr))
+    print(f"Calculated gain: {g_dc} Output Capacitance: {output_capacitance*1E+6}𝜇F")
     print(f"Calculated R_z: {r_z_val}Ω C_z: {c_z_val*1000*1000}𝜇F C_p: {c_p_val*1000*1000}𝜇F")
-    c_z = TrackedPart("Device", "C", value=linear.get_value_name(c_z_val))
-    c_p = TrackedPart("Device", "C", value=linear.get_value_name(c_p_val))
-    r_z = R(r_z_val)
+    c_z = _small_capacitor(c_z_val, _COMP_MAX_VOLTAGE)
+    c_p = _small_capacitor(c_p_val, _COMP_MAX_VOLTAGE)
+    r_z = resistor(r_z_val)
+
+    # Check the loop with the values that are actually placed (E24 snapped)
+    margins = loop_stability.analyze_tps54331(output_voltage, max_current, output_capacitance,
+        *(linear.e_series_number(v, 24) for v in (r_z_val, c_z_val, c_p_val)), r_esr=r_esr)
+    crossover, phase_margin, gain_margin = (float(v) for v in margins)
+    print(f"Loop crossover: {crossover} Hz Phase margin: {phase_margin}° Gain margin: {gain_margin} dB")
+    if not phase_margin >= _MIN_PHASE_MARGIN:
+        print(f"WARNING: The phase margin of the compensated loop is below {_MIN_PHASE_MARGIN}°")
 
     # Slow Start and undervoltage lockout
 
@@ -488,17 +535,18 @@ def buck_step_down_regular(vin: Net, out: Net, gnd: Net, output_voltage: float =
 
     # Construct the circuit:
 
-    lib = SchLib(SSP_LIB_PATH, tool=SKIDL)
+    lib = get_ssp_lib()
     tps = TrackedPart(lib, "TPS54331", footprint="SOIC-8_3.9x4.9mm_P1.27mm", sku="JLCPCB:C9865")
 
-    tps["VIN"] & inp & ( c_input_dec | ci3) & gnd
+    tps["VIN"] & inp
+    parallel(inp, gnd, c_input_dec + [ci3])
 
     tps["EN"] & r_en1 & inp
     tps["EN"] & r_en2 & gnd
     tps["SS"] & c_slow_start & gnd
     
     out & r5 & tps["VSNS"] & r6 & gnd
-    out & (c_o_1 | c_o_2 | c_out_dec) & gnd
+    parallel(out, gnd, [c_o_1, c_o_2] + c_out_dec)
 
     tps["BOOT"] & c_boot & tps["PH"]
     tps["PH"] & d & tps["GND"] 
@@ -507,5 +555,5 @@ def buck_step_down_regular(vin: Net, out: Net, gnd: Net, output_voltage: float =
     tps["COMP"] & (c_p | (c_z & r_z)) & gnd
     tps["GND"] += gnd
 
-    c_bulk_in = Part("Device", "CP", value="100µF", footprint="Capacitor_THT:CP_Radial_D6.3mm_P2.50mm")
+    c_bulk_in = CachedPart("Device", "CP", value="100µF", footprint="Capacitor_THT:CP_Radial_D6.3mm_P2.50mm")
     inp & c_bulk_in & gnd
\ No newline at end of file
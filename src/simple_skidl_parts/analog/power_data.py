@@ -3,6 +3,7 @@ This module contains data and data related methods for power related circuits
 """
 from typing import List, Tuple
 from pathlib import Path
+from functools import lru_cache
 
 from PIL import Image
 
@@ -69,6 +70,13 @@ def _get_linear_coord_appx(y_i: float, known_points:List[Tuple[float, float]]) -
     return (x_i-x_0)/(x_max-x_0)
         
 
+@lru_cache(maxsize=None)
+def _lm2596_chart() -> Image.Image:
+    image = Image.open(Path(__file__).parent / "lm2596_inductor.png")
+    image.load()
+    return image
+
+
 def get_lm2596_inductor_value(max_current:float, e_t:float) -> str:
     """
     Returns the correct inductor for the lm2596 buck converter
@@ -89,8 +97,7 @@ def get_lm2596_inductor_value(max_current:float, e_t:float) -> str:
         # The y coordinates are inversed in a PNG
         return max_y - int(_get_linear_coord_appx(e_t, _LM2596_INDUCTOR_KNOWN_POINTS_LOCATION["Y"])*max_y)
 
-    img_file = Path(__file__).parent / "lm2596_inductor.png"
-    image = Image.open(img_file)
+    image = _lm2596_chart()
 
     # according to the datasheet, the x axis starts from 0.6 up to 3.0A 
     # the y axis is 4 to 70 (V*us), however, those are not linearly scaled.
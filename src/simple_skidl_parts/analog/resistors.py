@@ -3,7 +3,7 @@ This module defines resistors and resistor networks
 """
 
 from skidl import *
-from simple_skidl_parts.parts_wrapper import TrackedPart
+from simple_skidl_parts.parts_wrapper import TrackedPart, CachedPart, has_suggested_part
 from ..units.linear import get_value_name
 
 def small_resistor(value: float, e_series: int=24) -> TrackedPart:
@@ -19,4 +19,21 @@ def small_resistor(value: float, e_series: int=24) -> TrackedPart:
     """
 
     val = get_value_name(value, e_series)
-    return TrackedPart("Device", "R", value=val)
\ No newline at end of file
+    return TrackedPart("Device", "R", value=val)
+
+def resistor(value: float, e_series: int=24) -> Part:
+    """
+    Like small_resistor, but values that are not in the suggested parts list are created
+    untracked (0805, without an SKU) instead of failing.
+
+    Args:
+        value: The number of ohms for the given resistor
+        e_series: The preferred number series to be used (24 for 5%, 48 for 1% and so on)
+
+    Returns:
+        Part: A tracked part if possible, an untracked one otherwise.
+    """
+    val = get_value_name(value, e_series)
+    if has_suggested_part("R", val):
+        return TrackedPart("Device", "R", value=val)
+    return CachedPart("Device", "R", value=val, footprint="R_0805_2012Metric")
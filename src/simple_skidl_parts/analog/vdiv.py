@@ -2,10 +2,11 @@ from skidl import *
 
 from ..units import linear
 from .resistors import small_resistor as R
+from ..circuit_context import subcircuit
+from .dc_models import vdiv_resistors
 
 @subcircuit
 def vdiv(inp, outp, gnd, ratio=2, rtot=1*linear.M):
-    r1 = ratio*rtot/(ratio+1)
-    r2 = rtot/(ratio+1)
+    r1, r2 = vdiv_resistors(ratio, rtot)
     inp & R(r1) & outp & \
         R(r2) & gnd
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Content addressed cache of whole design builds. A build is identified by a hash of the
+builder (its name and source file), its parameters, the library's source code and data files
+(including suggested_skus.json) and the versions of Python and skidl. When nothing of that
+changed, the netlist and BOM generated before are returned from the on-disk store instead of
+building the design again.
+"""
+
+import builtins
+import hashlib
+import inspect
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional
+
+from skidl import generate_netlist, reset
+
+from .kicad_index import _CACHE_DIR
+from .parts_wrapper import create_bom
+
+_LIBRARY_DIR = Path(__file__).parent
+_LIBRARY_SUFFIXES = (".py", ".json", ".png")
+
+_NETLIST_FILE = "netlist.net"
+_BOM_FILE = "bom.csv"
+
+
+class BuildResult(NamedTuple):
+    netlist: str
+    bom: str
+    cached: bool
+
+
+def _update_with_file(h, name: str, path: Path) -> None:
+    h.update(name.encode())
+    h.update(b"\0")
+    h.update(path.read_bytes())
+    h.update(b"\0")
+
+
+def library_hash() -> str:
+    """
+    Hash of the library's source code and data files.
+    """
+    h = hashlib.sha256()
+    for path in sorted(p for p in _LIBRARY_DIR.rglob("*") if p.suffix in _LIBRARY_SUFFIXES):
+        # Relative names, so the hash doesn't depend on where the library is installed
+        _update_with_file(h, path.relative_to(_LIBRARY_DIR).as_posix(), path)
+    return h.hexdigest()
+
+
+def build_key(builder: Callable, params: Dict, bom_provider: str) -> str:
+    """
+    The content address of a build.
+    """
+    h = hashlib.sha256()
+    h.update(f"{builder.__module__}.{builder.__qualname__}\0".encode())
+    src = inspect.getsourcefile(builder)
+    if src is not None:
+        _update_with_file(h, Path(src).name, Path(src))
+    h.update(json.dumps(params, sort_keys=True, default=repr).encode())
+    h.update(f"\0{bom_provider}\0{library_hash()}\0".encode())
+    h.update(f"{platform.python_version()}\0{version('skidl')}".encode())
+    return h.hexdigest()
+
+
+class BuildStore:
+    """
+    Directory of builds (one sub-directory per key). When the store grows beyond max_bytes the
+    least recently used builds are removed.
+    """
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = 256*1024*1024):
+        self.path = Path(path or _CACHE_DIR / "builds")
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[BuildResult]:
+        d = self.path / key
+        try:
+            result = BuildResult((d / _NETLIST_FILE).read_text(), (d / _BOM_FILE).read_text(), True)
+        except FileNotFoundError:
+            return None
+        os.utime(d)     # Mark as recently used
+        return result
+
+    def put(self, key: str, netlist: str, bom: str) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed, so a concurrent reader never sees a partial build
+        tmp = Path(tempfile.mkdtemp(dir=self.path, prefix=".tmp-"))
+        (tmp / _NETLIST_FILE).write_text(netlist)
+        (tmp / _BOM_FILE).write_text(bom)
+        try:
+            tmp.rename(self.path / key)
+        except OSError:
+            shutil.rmtree(tmp)   # Another process stored the same build
+        self.evict()
+
+    def evict(self) -> None:
+        builds = []
+        for d in self.path.iterdir():
+            if d.is_dir() and not d.name.startswith("."):
+                size = sum(f.stat().st_size for f in d.iterdir())
+                builds.append((d.stat().st_mtime, size, d))
+        total = sum(size for _, size, _ in builds)
+        for _, size, d in sorted(builds):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(d, ignore_errors=True)
+            total -= size
+
+
+def cached_build(builder: Callable[..., None], params: Optional[Dict] = None, bom_provider: str = "JLCPCB",
+                 store: Optional[BuildStore] = None) -> BuildResult:
+    """
+    Returns the netlist and BOM of a design, building it (in a fresh default circuit) only if
+    it is not in the store yet.
+
+    Args:
+        builder (Callable[..., None]): Builds the design in the default circuit
+        params (Dict, optional): Keyword arguments of the builder
+        bom_provider (str, optional): The BOM format (see create_bom). Defaults to "JLCPCB".
+        store (BuildStore, optional): Defaults to a store in the user's cache directory
+
+    Returns:
+        BuildResult: The netlist, the BOM and whether they came from the cache
+    """
+    params = params or {}
+    store = store or BuildStore()
+    key = build_key(builder, params, bom_provider)
+    result = store.get(key)
+    if result is not None:
+        print(f"Using cached build {key[:12]}")
+        return result
+
+    reset()
+    builder(**params)
+    netlist = io.StringIO()
+    generate_netlist(file_=netlist)
+    with tempfile.TemporaryDirectory() as d:
+        bom_file = Path(d) / _BOM_FILE
+        create_bom(bom_provider, bom_file, builtins.default_circuit)
+        bom = bom_file.read_text()
+
+    store.put(key, netlist.getvalue(), bom)
+    return BuildResult(netlist.getvalue(), bom, False)
@@ -0,0 +1,80 @@
+"""
+Indexed part catalogs used for automatic component selection. A catalog is a table of parts
+(dicts) sorted by price, with a sorted index per numeric attribute and a hash index per
+categorical attribute, so that multi-constraint queries only touch the matching rows.
+"""
+
+import bisect
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class Catalog:
+    """
+    An immutable table of parts. Every row must have a "price" and rows are kept sorted by it,
+    so the cheapest match of a query is the one with the smallest row index.
+    """
+    def __init__(self, rows: Iterable[Dict]):
+        self.rows: List[Dict] = sorted(rows, key=lambda r: r["price"])
+        self._sorted: Dict[str, Tuple[List[float], List[int]]] = {}
+        self._by_value: Dict[str, Dict[object, set]] = {}
+
+        attrs = {k for r in self.rows for k in r}
+        for attr in attrs:
+            values = [(r[attr], i) for i, r in enumerate(self.rows) if r.get(attr) is not None]
+            if values and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v, _ in values):
+                values.sort()
+                self._sorted[attr] = ([v for v, _ in values], [i for _, i in values])
+            by_value: Dict[object, set] = {}
+            for v, i in values:
+                if isinstance(v, (str, int, float, bool)):
+                    by_value.setdefault(v, set()).add(i)
+            self._by_value[attr] = by_value
+
+    def _range(self, attr: str, low: Optional[float], high: Optional[float]) -> set:
+        values, idx = self._sorted.get(attr, ([], []))
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        end = len(values) if high is None else bisect.bisect_right(values, high)
+        return set(idx[start:end])
+
+    def query(self, equals: Optional[Dict] = None, mins: Optional[Dict] = None,
+              maxs: Optional[Dict] = None) -> List[Dict]:
+        """
+        Returns all the rows matching every constraint, cheapest first.
+
+        Args:
+            equals (Dict, optional): attribute -> required value
+            mins (Dict, optional): attribute -> minimal (inclusive) value
+            maxs (Dict, optional): attribute -> maximal (inclusive) value
+        """
+        equals, mins, maxs = equals or {}, mins or {}, maxs or {}
+        candidates = [self._by_value.get(a, {}).get(v, set()) for a, v in equals.items()]
+        for attr in set(mins) | set(maxs):
+            candidates.append(self._range(attr, mins.get(attr), maxs.get(attr)))
+        if not candidates:
+            return list(self.rows)
+
+        candidates.sort(key=len)
+        matching = set(candidates[0])
+        for c in candidates[1:]:
+            matching &= c
+            if not matching:
+                break
+        return [self.rows[i] for i in sorted(matching)]
+
+    def cheapest(self, equals: Optional[Dict] = None, mins: Optional[Dict] = None,
+                 maxs: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Returns the cheapest row matching every constraint (see query) or None.
+        """
+        matching = self.query(equals, mins, maxs)
+        return matching[0] if matching else None
+
+
+def load_catalogs(path: Path) -> Dict[str, Catalog]:
+    """
+    Loads a JSON file of {table name: [rows]} into catalogs.
+    """
+    with open(path) as f:
+        return {name: Catalog(rows) for name, rows in json.load(f).items()}
@@ -0,0 +1,69 @@
+"""
+The circuit the library builds into. skidl adds everything to its global default circuit; the
+library's builders add to the circuit of the current context instead (a context variable, so
+every thread and asyncio task has its own), which falls back to the default circuit:
+
+    with use_circuit() as circ:
+        vdiv(Net("VIN", circuit=circ), Net("OUT", circuit=circ), Net("GND", circuit=circ))
+
+Several designs can then be built at the same time in threads or tasks, each in its own
+circuit. A circuit itself is not thread safe, so don't build into the same one concurrently.
+
+Only the library's own @subcircuit (below) is context aware. It tracks the hierarchy in the
+circuit it builds into, like skidl's does. Builders decorated with skidl's @package are still
+instantiated by skidl, which swaps the global default circuit while doing so, and skidl's
+ERC and netlisting also use the global state. So instantiate packages, run ERC and generate
+the netlist of a circuit inside its use_circuit() block, one circuit at a time.
+"""
+
+import builtins
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from skidl.circuit import Circuit
+
+_CURRENT: ContextVar[Optional[Circuit]] = ContextVar("simple_skidl_parts_circuit", default=None)
+
+
+def current_circuit() -> Circuit:
+    """
+    The circuit of the current context, or skidl's default circuit outside use_circuit().
+    """
+    return _CURRENT.get() or builtins.default_circuit
+
+
+@contextmanager
+def use_circuit(circuit: Optional[Circuit] = None):
+    """
+    Makes the library build into the given circuit (a new one if None) inside the with block.
+
+    Yields:
+        Circuit: The circuit
+    """
+    circuit = Circuit() if circuit is None else circuit
+    token = _CURRENT.set(circuit)
+    try:
+        yield circuit
+    finally:
+        _CURRENT.reset(token)
+
+
+def subcircuit(func: Callable) -> Callable:
+    """
+    Like skidl's @subcircuit (including the optional circuit argument), but builds in the
+    circuit of the current context instead of replacing the global default circuit.
+    """
+    @functools.wraps(func)
+    def sub_f(*args, circuit: Optional[Circuit] = None, **kwargs):
+        circ = circuit or current_circuit()
+        hierarchy, level = circ.hierarchy, circ.level
+        circ.hierarchy = f"{hierarchy}.{func.__name__}{level}"
+        circ.level += 1
+        try:
+            with use_circuit(circ):
+                return func(*args, **kwargs)
+        finally:
+            circ.hierarchy, circ.level = hierarchy, level
+    return sub_f
@@ -0,0 +1,166 @@
+"""
+A local build daemon that keeps skidl, the library, the KiCad indexes, the SKU list and the
+part templates loaded, and runs design scripts on request in a clean default circuit:
+
+    ssp-daemon serve &                          # Start the daemon (once)
+    ssp-daemon run examples/esp32_with_temp.py  # Build a design using the warm process
+    ssp-daemon stop
+
+Requests and responses are single JSON lines over a UNIX socket. Scripts run one at a time
+since skidl's default circuit is global.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import pkgutil
+import runpy
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from skidl import reset
+
+from .kicad_index import _CACHE_DIR, footprint_index, symbol_index
+from .parts_wrapper import _read_parts_skus, part_template, TrackedPart
+
+DEFAULT_SOCKET = Path(os.environ.get("SSP_DAEMON_SOCKET", _CACHE_DIR / "daemon.sock"))
+
+# Templates of the parts most designs use, created when the daemon starts
+_WARM_PARTS = [("Device", "R"), ("Device", "C"), ("Device", "CP"), ("Device", "L"), ("Device", "LED_Small"),
+               ("Transistor_BJT", "BC847"), ("Switch", "SW_SPST")]
+
+
+def warm_up() -> None:
+    """
+    Imports the whole library and loads everything that is cached per process.
+    """
+    import simple_skidl_parts
+    from .analog.power_data import _lm2596_chart
+
+    for info in pkgutil.walk_packages(simple_skidl_parts.__path__, "simple_skidl_parts."):
+        importlib.import_module(info.name)
+    _read_parts_skus()
+    _lm2596_chart()
+    symbol_index()
+    footprint_index()
+    for lib, name in _WARM_PARTS:
+        part_template(lib, name, part_class=TrackedPart)
+
+
+def run_script(script: str, args: Optional[List[str]] = None, cwd: Optional[str] = None) -> Dict:
+    """
+    Runs a design script as __main__ in a fresh default circuit.
+
+    Returns:
+        Dict: ok, output (stdout and stderr), error (traceback, if any) and time (s)
+    """
+    reset()
+    output = io.StringIO()
+    old_argv, old_cwd = sys.argv, os.getcwd()
+    sys.argv = [script] + list(args or [])
+    error = None
+    start = time.perf_counter()
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            error = f"SystemExit: {e.code}"
+    except BaseException:
+        error = traceback.format_exc()
+    finally:
+        sys.argv = old_argv
+        os.chdir(old_cwd)
+    return {"ok": error is None, "output": output.getvalue(), "error": error,
+            "time": time.perf_counter() - start}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        cmd = request.get("cmd")
+        if cmd == "run":
+            response = run_script(request["script"], request.get("args"), request.get("cwd"))
+        elif cmd == "ping":
+            response = {"ok": True}
+        elif cmd == "stop":
+            response = {"ok": True}
+            self.server.stopping = True
+        else:
+            response = {"ok": False, "error": f"Unknown command {cmd!r}"}
+        self.wfile.write((json.dumps(response) + "\n").encode())
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, path: Path = DEFAULT_SOCKET):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()   # Left over from a daemon that didn't stop cleanly
+        self.stopping = False
+        super().__init__(str(path), _Handler)
+
+    def serve(self) -> None:
+        while not self.stopping:
+            self.handle_request()
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.server_address)
+
+
+def request(message: Dict, path: Path = DEFAULT_SOCKET) -> Dict:
+    """
+    Sends one request to the daemon and returns its response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(path))
+        s.sendall((json.dumps(message) + "\n").encode())
+        with s.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm build daemon for skidl design scripts")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("serve", help="Start the daemon")
+    run = sub.add_parser("run", help="Run a design script in the daemon")
+    run.add_argument("script")
+    run.add_argument("args", nargs=argparse.REMAINDER)
+    sub.add_parser("ping", help="Check that the daemon is running")
+    sub.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "serve":
+        warm_up()
+        with DaemonServer(args.socket) as server:
+            print(f"Listening on {args.socket}")
+            server.serve()
+        return 0
+
+    message = {"cmd": args.cmd}
+    if args.cmd == "run":
+        message.update(script=str(Path(args.script).resolve()), args=args.args, cwd=os.getcwd())
+    response = request(message, args.socket)
+    if args.cmd == "run":
+        sys.stdout.write(response["output"])
+        if response["error"]:
+            sys.stderr.write(response["error"])
+        print(f"Built in {response['time']:.2f}s")
+    return 0 if response["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
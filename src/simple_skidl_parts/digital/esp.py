@@ -11,12 +11,11 @@ from skidl import *
 from .usb import slow_micro_usb_with_power
 from ..analog.resistors import small_resistor as _R
 from ..analog.led import LedSingleColors, led_with_bjt
+from ..analog.networks import parallel
+from ..circuit_context import current_circuit, subcircuit
 
 def _add_decoupling_caps_esp32(v33: Net, gnd: Net):
-    caps = [TrackedPart("Device", "C", value=val) for val in ("100p", "1u", "10u")]
-    for c in caps:
-        v33 & c[1]
-        c[2] & gnd
+    parallel(v33, gnd, [TrackedPart("Device", "C", value=val) for val in ("100p", "1u", "10u")])
 
 def get_usable_gpios() -> List[str]:
     """
@@ -92,10 +91,11 @@ def esp32_s2_with_serial_usb(mcu: Part) -> Bus:
         required for FTDI programming, "flash" and "reset" pins that can be directly attached to a switch
         connected to ground.
     """
-    usb = slow_micro_usb_with_power()
-    gnd = Net.get("GND")
-    v33 = Net.get("+3V3")
-    v5 = Net("+5V")
+    circ = current_circuit()
+    usb = slow_micro_usb_with_power(circuit=circ)
+    gnd = Net.get("GND", circuit=circ)
+    v33 = Net.get("+3V3", circuit=circ)
+    v5 = Net("+5V", circuit=circ)
 
     gnd += usb.gnd
     v33 += usb.v33
@@ -110,20 +110,20 @@ def esp32_s2_with_serial_usb(mcu: Part) -> Bus:
     for p in mcu["GND"]:
         p += gnd
     
-    flash, rst = Net("~FLASH"), Net("~RESET")
+    flash, rst = Net("~FLASH", circuit=circ), Net("~RESET", circuit=circ)
     for norm_hi, p in zip([flash, rst], ["IO00", "EN"]):
         norm_hi & _R(10000) & v33
         norm_hi += mcu[p]
     
-    dtr, cts = Net("DTR"), Net("CTS")
+    dtr, cts = Net("DTR", circuit=circ), Net("CTS", circuit=circ)
     _dtr_cts_to_esp(dtr, cts, gnd, flash, rst)
     rst += mcu["EN"]
     flash += mcu["IO00"]
-    comm = Bus("programming", dtr, mcu["TXD0"], mcu["RXD0"], v33, cts, gnd)
+    comm = Bus("programming", dtr, mcu["TXD0"], mcu["RXD0"], v33, cts, gnd, circuit=circ)
 
     led_with_bjt(mcu["IO13"], gnd, v33, 3.3, LedSingleColors.YELLOW, 1.6)   # Yellow, since the Vf of a BLUE or GREEN may be too high for 3v3 logic
 
-    return Bus("usb_esp", v33, gnd, v5, comm, flash, rst)
+    return Bus("usb_esp", v33, gnd, v5, comm, flash, rst, circuit=circ)
     
 
 @subcircuit
@@ -145,7 +145,8 @@ def esp32_wroom_external_programmer(mcu: Part, v33: Net, gnd: Net) -> Bus:
     for p in mcu["GND"]:
         p += gnd
     
-    flash, rst = Net("~FLASH"), Net("~RESET")
+    circ = current_circuit()
+    flash, rst = Net("~FLASH", circuit=circ), Net("~RESET", circuit=circ)
     c_en = TrackedPart("Device", "C", value="1u")
     gnd & c_en & rst
 
@@ -164,4 +165,4 @@ def esp32_wroom_external_programmer(mcu: Part, v33: Net, gnd: Net) -> Bus:
 
     mcu.match_pin_regex = True
 
-    return Bus("wroom_esp", v33, gnd, flash, rst, mcu[".*XD0.*"])
\ No newline at end of file
+    return Bus("wroom_esp", v33, gnd, flash, rst, mcu[".*XD0.*"], circuit=circ)
\ No newline at end of file
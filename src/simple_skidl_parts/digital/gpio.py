@@ -0,0 +1,269 @@
+"""
+GPIO allocation for ESP32 type MCUs. Pin capabilities are kept as bitsets (bit n is GPIOn) so
+that the candidate pins of every signal are computed with a few integer operations. Candidates
+are then narrowed by constraint propagation and the signals are assigned to pins with a minimum
+cost matching over the pin preference order.
+"""
+
+from enum import IntFlag
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class Cap(IntFlag):
+    ADC1 = 1
+    ADC2 = 2
+    TOUCH = 4
+    STRAPPING = 8
+    INPUT_ONLY = 16
+    OUTPUT = 32
+    USB = 64
+    RTC = 128
+    DAC = 256
+    UART0 = 512
+
+
+def _mask(gpios: Iterable[int]) -> int:
+    m = 0
+    for g in gpios:
+        m |= 1 << g
+    return m
+
+
+def _bits(mask: int) -> List[int]:
+    gpios = []
+    while mask:
+        low = mask & -mask
+        gpios.append(low.bit_length()-1)
+        mask ^= low
+    return gpios
+
+
+class GpioChip:
+    """
+    The GPIOs of a chip, their capabilities (as bitsets) and their order of preference.
+    """
+    def __init__(self, name: str, gpios: Iterable[int], caps: Dict[Cap, Iterable[int]], preference: Sequence[int]):
+        self.name = name
+        self.available = _mask(gpios)
+        self.caps = {cap: _mask(caps.get(cap, ())) & self.available for cap in Cap}
+        self.caps[Cap.OUTPUT] = self.available & ~self.caps[Cap.INPUT_ONLY]
+        # Pins that are not in the preference list come last, by number
+        order = list(preference) + [g for g in _bits(self.available) if g not in preference]
+        self.rank = {g: i for i, g in enumerate(order)}
+
+    def mask(self, caps: Cap, any_of: bool = False) -> int:
+        """
+        Returns the pins having all (or any) of the capabilities.
+        """
+        m = 0 if any_of else self.available
+        for cap in Cap:
+            if caps & cap:
+                m = (m | self.caps[cap]) if any_of else (m & self.caps[cap])
+        return m
+
+    @staticmethod
+    def pin_name(gpio: int) -> str:
+        return f"IO{gpio:02d}"
+
+
+ESP32 = GpioChip(
+    "ESP32",
+    gpios=[0, 1, 2, 3, 4, 5, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 23, 25, 26, 27, 32, 33, 34, 35, 36, 39],
+    caps={
+        Cap.ADC1: [32, 33, 34, 35, 36, 37, 38, 39],
+        Cap.ADC2: [0, 2, 4, 12, 13, 14, 15, 25, 26, 27],
+        Cap.TOUCH: [0, 2, 4, 12, 13, 14, 15, 27, 32, 33],
+        Cap.STRAPPING: [0, 2, 5, 12, 15],
+        Cap.INPUT_ONLY: [34, 35, 36, 37, 38, 39],
+        Cap.RTC: [0, 2, 4, 12, 13, 14, 15, 25, 26, 27, 32, 33, 34, 35, 36, 37, 38, 39],
+        Cap.DAC: [25, 26],
+        Cap.UART0: [1, 3],
+    },
+    # Same order as get_usable_gpios
+    preference=[35, 34, 33, 26, 14, 12, 13, 15, 2, 4, 16, 17, 5, 18, 23, 19, 22, 3, 1, 21],
+)
+
+ESP32_S2 = GpioChip(
+    "ESP32-S2",
+    gpios=list(range(0, 22)) + list(range(33, 47)),
+    caps={
+        Cap.ADC1: range(1, 11),
+        Cap.ADC2: range(11, 21),
+        Cap.TOUCH: range(1, 15),
+        Cap.STRAPPING: [0, 45, 46],
+        Cap.INPUT_ONLY: [46],
+        Cap.USB: [19, 20],
+        Cap.RTC: range(0, 22),
+        Cap.DAC: [17, 18],
+        Cap.UART0: [43, 44],
+    },
+    preference=list(range(1, 19)) + [21] + list(range(33, 43)),
+)
+
+# Pins with these capabilities are only used by signals that explicitly require them
+DEFAULT_AVOID = Cap.STRAPPING | Cap.UART0 | Cap.USB
+
+
+class Signal:
+    """
+    A signal that needs a GPIO.
+
+    Args:
+        name (str): The signal's name
+        requires (Cap): The pin must have all of these capabilities (e.g. Cap.OUTPUT | Cap.TOUCH)
+        any_of (Cap): The pin must have at least one of these (e.g. Cap.ADC1 | Cap.ADC2)
+        avoid (Cap): Don't use pins with these capabilities, unless required
+        pins (Iterable[int], optional): Restrict the signal to these GPIO numbers
+    """
+    def __init__(self, name: str, requires: Cap = Cap(0), any_of: Cap = Cap(0), avoid: Cap = DEFAULT_AVOID,
+                 pins: Optional[Iterable[int]] = None):
+        self.name = name
+        self.requires = requires
+        self.any_of = any_of
+        self.avoid = avoid & ~requires & ~any_of
+        self.pins = None if pins is None else _mask(pins)
+
+    def candidates(self, chip: GpioChip) -> int:
+        m = chip.mask(self.requires)
+        if self.any_of:
+            m &= chip.mask(self.any_of, any_of=True)
+        m &= ~chip.mask(self.avoid, any_of=True)
+        if self.pins is not None:
+            m &= self.pins
+        return m
+
+
+class GpioAllocationError(ValueError):
+    def __init__(self, conflicts: List[str]):
+        super().__init__("Cannot allocate GPIOs:\n" + "\n".join(conflicts))
+        self.conflicts = conflicts
+
+
+def _propagate(domains: Dict[str, int]) -> None:
+    """
+    Removes the pins of signals that have a single candidate from all other signals until
+    nothing changes. Raises on an empty domain.
+    """
+    fixed: Dict[int, str] = {}
+    changed = True
+    while changed:
+        changed = False
+        for name, d in domains.items():
+            if d and d & (d-1) == 0 and d not in fixed:
+                fixed[d] = name
+                for n2 in domains:
+                    if n2 != name and domains[n2] & d:
+                        domains[n2] &= ~d
+                        changed = True
+            if not domains[name]:
+                taken = [n for m, n in fixed.items() if n != name]
+                raise GpioAllocationError([f"{name}: every candidate pin is already the only option of {', '.join(taken) or 'another signal'}"])
+
+
+def _max_matching(order: List[str], domains: Dict[str, int]) -> Dict[str, int]:
+    """
+    Kuhn's augmenting paths. Raises with a Hall violation (a set of signals that have fewer
+    candidate pins between them than signals) if not every signal can get a pin.
+    """
+    owner: Dict[int, str] = {}
+
+    def _augment(name, seen_pins, seen_signals):
+        seen_signals.add(name)
+        for g in _bits(domains[name]):
+            if g in seen_pins:
+                continue
+            seen_pins.add(g)
+            if g not in owner or _augment(owner[g], seen_pins, seen_signals):
+                owner[g] = name
+                return True
+        return False
+
+    for name in order:
+        seen_pins, seen_signals = set(), set()
+        if not _augment(name, seen_pins, seen_signals):
+            pins = ", ".join(GpioChip.pin_name(g) for g in sorted(seen_pins))
+            raise GpioAllocationError([
+                f"{len(seen_signals)} signals ({', '.join(sorted(seen_signals))}) share only "
+                f"{len(seen_pins)} candidate pins ({pins})"])
+    return {name: g for g, name in owner.items()}
+
+
+def _min_cost_assignment(cost: List[List[int]]) -> List[int]:
+    """
+    Hungarian algorithm for a rectangular cost matrix (rows <= columns). Returns the column of
+    every row.
+    """
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u, v = [0]*(n+1), [0]*(m+1)
+    p, way = [0]*(m+1), [0]*(m+1)
+    for i in range(1, n+1):
+        p[0] = i
+        j0 = 0
+        minv = [inf]*(m+1)
+        used = [False]*(m+1)
+        while True:
+            used[j0] = True
+            i0, delta, j1 = p[j0], inf, 0
+            for j in range(1, m+1):
+                if not used[j]:
+                    cur = cost[i0-1][j-1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j], way[j] = cur, j0
+                    if minv[j] < delta:
+                        delta, j1 = minv[j], j
+            for j in range(m+1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    result = [0]*n
+    for j in range(1, m+1):
+        if p[j]:
+            result[p[j]-1] = j-1
+    return result
+
+
+def allocate_gpios(signals: Sequence[Signal], chip: GpioChip = ESP32, reserved: Iterable[int] = ()) -> Dict[str, str]:
+    """
+    Assigns a GPIO to every signal, using the most preferred pins possible.
+
+    Args:
+        signals (Sequence[Signal]): The signals to place
+        chip (GpioChip, optional): The chip's description. Defaults to ESP32.
+        reserved (Iterable[int], optional): GPIOs that are already used
+
+    Raises:
+        GpioAllocationError: With an explanation of the conflict if there is no valid assignment
+
+    Returns:
+        Dict[str, str]: Signal name to pin name (e.g. "IO13")
+    """
+    if not signals:
+        return {}
+    free = ~_mask(reserved)
+    domains = {s.name: s.candidates(chip) & free for s in signals}
+    empty = [s for s in signals if not domains[s.name]]
+    if empty:
+        raise GpioAllocationError([
+            f"{s.name}: no free pin has {s.requires!r}" + (f" and any of {s.any_of!r}" if s.any_of else "")
+            + f" without {s.avoid!r}" for s in empty])
+
+    _propagate(domains)
+    # Most constrained first, so conflicts are reported about the signals that cause them
+    order = sorted(domains, key=lambda n: bin(domains[n]).count("1"))
+    _max_matching(order, domains)
+
+    pins = _bits(chip.available)
+    impossible = len(pins) * len(pins) + 1
+    cost = [[chip.rank[g] if domains[name] >> g & 1 else impossible for g in pins] for name in order]
+    columns = _min_cost_assignment(cost)
+    return {name: chip.pin_name(pins[c]) for name, c in zip(order, columns)}
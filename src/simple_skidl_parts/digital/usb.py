@@ -6,6 +6,7 @@ from simple_skidl_parts.parts_wrapper import TrackedPart
 from simple_skidl_parts.analog.power import low_dropout_power
 from simple_skidl_parts.analog.led import led_simple, LedSingleColors
 from skidl import *
+from simple_skidl_parts.circuit_context import current_circuit, subcircuit
 
 @subcircuit
 def usb_to_serial(convert_to_voltage: float = 3.3) -> Bus:
@@ -18,7 +19,8 @@ def usb_to_serial(convert_to_voltage: float = 3.3) -> Bus:
     Returns:
         Bus: A set of pins to be used as the UART output and
     """
-    bus = slow_micro_usb_with_power(convert_to_voltage=convert_to_voltage)
+    circ = current_circuit()
+    bus = slow_micro_usb_with_power(convert_to_voltage=convert_to_voltage, circuit=circ)
     v33 = bus[1]
     gnd = bus["GND"]
     v5  = bus["+5V"]
@@ -26,13 +28,13 @@ def usb_to_serial(convert_to_voltage: float = 3.3) -> Bus:
     usb_to_uart_chip = TrackedPart("Interface_USB", "CH340G", footprint="SOIC-16_3.9x9.9_P1.27mm", sku="JLCPCB:C14267")
 
     t_rts, t_dtr = [TrackedPart("Transistor_BJT", "BC847", value="MMBT5551", footprint="SOT-23", sku="JLCPCB:C2145") for a in [1,2]]
-    dtr, rts, rx, tx, en, ch_pd,  = [Net(sig) for sig in ["DTR", "RTS", "RX", "TX"]]
+    dtr, rts, rx, tx, en, ch_pd,  = [Net(sig, circuit=circ) for sig in ["DTR", "RTS", "RX", "TX"]]
 
     crystal = TrackedPart("Device", "Crystal_GND24", value="12MHz", footprint="Crystal_SMD_3225-4Pin_3.2x2.5mm", sku="C97242")
     c_crys1, c_crys2 = [TrackedPart("Device", "C", value="22p") for a in (1,2)]
 
     for yx, color in zip([rx, tx, v33], [LedSingleColors.RED, LedSingleColors.GREEN, LedSingleColors.BLUE]):
-        led = led_simple(sig_voltage=3.3, color=color)
+        led = led_simple(sig_voltage=3.3, color=color, circuit=circ)
         led.signal += yx
         led.gnd += gnd
     
@@ -47,7 +49,8 @@ def slow_micro_usb_with_power(v33, gnd, v5, dp, dm, convert_to_voltage: float=3.
     as a power source.
     
     Args:
-        convert_to_voltage (float): What voltage to convert the power to
+        convert_to_voltage (float): What voltage to convert the power to. The regulator gets up to 1A
+            from the bus, which only the 3.3V one supports (see low_dropout_power).
         esd_protection: Add ESD protection circuit to the bus, Defaults to True
 
     Returns:
@@ -55,7 +58,8 @@ def slow_micro_usb_with_power(v33, gnd, v5, dp, dm, convert_to_voltage: float=3.
     """
     #usb_connector = TrackedPart("Connector", "USB_C_Receptacle", footprint="MOLEX_105450-0101", sku="JLCPCB:C134092")
     usb_connector = TrackedPart("Connector", "USB_B_Micro", footprint="USB_Micro-B_Amphenol_10118194_Horizontal", sku="JLCPCB:C132563")
-    usb_connector["ID"] += NC
+    circ = current_circuit()
+    usb_connector["ID"] += circ.NC
 
     v5.drive = POWER
     gnd.drive = POWER
@@ -66,9 +70,9 @@ def slow_micro_usb_with_power(v33, gnd, v5, dp, dm, convert_to_voltage: float=3.
     usb_connector["GND"] | gnd
     usb_connector["VBUS"] |  v5
 
-    usb_connector["SHIELD"] += NC
-    dp += Net("PROT_USB_D+")
-    dm += Net("PROT_USB_D-")
+    usb_connector["SHIELD"] += circ.NC
+    dp += Net("PROT_USB_D+", circuit=circ)
+    dm += Net("PROT_USB_D-", circuit=circ)
 
     if esd_protection:
         # The following "PESD3V3L5UY" has the same pinout as the "SMF05CT1G" that is a part of the JLCPCB collection.
@@ -0,0 +1,142 @@
+"""
+Design rule check of component ratings. Parts carry their absolute maximum ratings (voltage,
+current, power) and nets carry their operating point (voltage, current). The check packs both
+into arrays and compares, for every rated part at once:
+    voltage stress: the highest minus the lowest voltage of the nets on its pins
+    current stress: the highest current of the nets on its pins
+    power stress: the product of the two (an upper bound)
+Nets without an operating point are ignored, so annotate ground (0V) too.
+"""
+
+import math
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .circuit_context import current_circuit
+
+_KINDS = ("voltage", "current", "power")
+
+# Catalog columns holding each rating (see active_parts.json and capacitors.json)
+_RATING_COLUMNS = {
+    "voltage": ("vds_max", "vr_max", "vin_max", "voltage"),
+    "current": ("id_max", "if_max", "iout_max"),
+    "power": ("power",),
+}
+
+
+class DrcViolation(NamedTuple):
+    ref: str
+    kind: str           # "voltage", "current" or "power"
+    stress: float
+    rating: float
+
+
+def set_ratings(part, voltage: Optional[float] = None, current: Optional[float] = None,
+                power: Optional[float] = None):
+    """
+    Sets (or updates) the absolute maximum ratings of a part (V, A, W). Returns the part.
+    """
+    ratings = dict(getattr(part, "ratings", None) or {})
+    for kind, value in zip(_KINDS, (voltage, current, power)):
+        if value is not None:
+            ratings[kind] = value
+    part.ratings = ratings
+    return part
+
+
+def ratings_from_row(part, row: Dict):
+    """
+    Sets the ratings of a part created from a catalog row. Returns the part.
+    """
+    found = {kind: next((row[c] for c in columns if row.get(c) is not None), None)
+             for kind, columns in _RATING_COLUMNS.items()}
+    return set_ratings(part, **found)
+
+
+def set_operating_point(net, voltage: Optional[float] = None, current: Optional[float] = None):
+    """
+    Sets the (worst case) voltage (V) and current (A) of a net. Returns the net.
+    """
+    if voltage is not None:
+        net.op_voltage = voltage
+    if current is not None:
+        net.op_current = current
+    return net
+
+
+def _net_operating_points(circ):
+    """
+    Returns the index of every net (joined nets share one) and the voltage and current arrays.
+    """
+    index: Dict[int, int] = {}
+    voltages, currents = [], []
+    for net in circ.nets:
+        if id(net) in index:
+            continue
+        joined = net.nets
+        for n in joined:
+            index[id(n)] = len(voltages)
+        voltages.append(max((n.op_voltage for n in joined if hasattr(n, "op_voltage")), default=math.nan))
+        currents.append(max((n.op_current for n in joined if hasattr(n, "op_current")), default=math.nan))
+    return index, np.array(voltages, float), np.array(currents, float)
+
+
+def check_ratings(circuit=None, margin: float = 1.0) -> List[DrcViolation]:
+    """
+    Checks every rated part of the circuit against the operating points of its nets.
+
+    Args:
+        circuit (Circuit, optional): Defaults to the current circuit (see circuit_context)
+        margin (float, optional): The fraction of the ratings that may be used (e.g. 0.8)
+
+    Returns:
+        List[DrcViolation]: The violations, by part order
+    """
+    circ = circuit or current_circuit()
+    net_index, net_v, net_i = _net_operating_points(circ)
+
+    parts, ratings, pin_part, pin_net = [], [], [], []
+    for part in circ.parts:
+        r = getattr(part, "ratings", None)
+        if not r:
+            continue
+        idx = len(parts)
+        parts.append(part)
+        ratings.append([r.get(kind, math.inf) for kind in _KINDS])
+        for pin in part.pins:
+            net = pin.net
+            if net is not None and id(net) in net_index:
+                pin_part.append(idx)
+                pin_net.append(net_index[id(net)])
+    if not parts:
+        return []
+
+    n = len(parts)
+    pin_part, pin_net = np.array(pin_part, int), np.array(pin_net, int)
+    v_hi, v_lo, i_hi = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    np.fmax.at(v_hi, pin_part, net_v[pin_net])
+    np.fmin.at(v_lo, pin_part, net_v[pin_net])
+    np.fmax.at(i_hi, pin_part, net_i[pin_net])
+
+    stress = np.empty((n, 3))
+    stress[:, 0] = v_hi - v_lo
+    stress[:, 1] = i_hi
+    stress[:, 2] = stress[:, 0]*stress[:, 1]
+    limits = np.array(ratings, float)*margin
+
+    with np.errstate(invalid="ignore"):
+        over = stress > limits      # nan (unknown) stresses compare False
+    return [DrcViolation(parts[p].ref, _KINDS[k], float(stress[p, k]), float(limits[p, k]))
+            for p, k in zip(*np.nonzero(over))]
+
+
+def drc_report(violations: List[DrcViolation]) -> str:
+    units = {"voltage": "V", "current": "A", "power": "W"}
+    if not violations:
+        return "No rating violations"
+    lines = [f"{len(violations)} rating violations:"]
+    for v in violations:
+        u = units[v.kind]
+        lines.append(f"  {v.ref}: {v.kind} {v.stress:.3g}{u} exceeds {v.rating:.3g}{u}")
+    return "\n".join(lines)
@@ -0,0 +1,337 @@
+"""
+Persistent index of the KiCad libraries. Instead of letting skidl parse whole library files to
+find a single symbol, the index maps each symbol to its library file and byte range. The index
+is stored on disk and a library is only rescanned when its modification time or size changes.
+The footprint libraries are indexed the same way so a whole design can be checked for unknown
+footprints without touching the file system per part.
+"""
+
+import difflib
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_INDEX_VERSION = 1
+
+_CACHE_DIR = Path(os.environ.get("SSP_CACHE_DIR", Path.home() / ".cache" / "simple_skidl_parts"))
+
+_SYMBOL_DIR_ENV_VARS = ["KICAD_SYMBOL_DIR", "KICAD6_SYMBOL_DIR", "KICAD7_SYMBOL_DIR", "KICAD8_SYMBOL_DIR"]
+
+_FOOTPRINT_DIR_ENV_VARS = ["KICAD_FOOTPRINT_DIR", "KICAD6_FOOTPRINT_DIR", "KICAD7_FOOTPRINT_DIR",
+                           "KICAD8_FOOTPRINT_DIR", "KISYSMOD"]
+_FOOTPRINT_LIB_SUFFIX = ".pretty"
+_FOOTPRINT_SUFFIX = ".kicad_mod"
+
+_V5_SUFFIX = ".lib"
+_V6_SUFFIX = ".kicad_sym"
+
+_V5_DEF = re.compile(rb"^DEF\s+~?(\S+)\s", re.M)
+_V5_ENDDEF = re.compile(rb"^ENDDEF[^\n]*\n?", re.M)
+_V5_ALIAS = re.compile(rb"^ALIAS\s+([^\r\n]+)", re.M)
+_V5_HEADER = "EESchema-LIBRARY Version 2.4\n#encoding utf-8\n"
+_V5_FOOTER = "#\n#End Library\n"
+
+# Only the top level symbols are indented by one level (two spaces, or a tab since KiCad 7). The
+# units of a symbol are nested deeper.
+_V6_SYMBOL = re.compile(rb'^(?:  |\t)\(symbol\s+"([^"]+)"', re.M)
+_V6_EXTENDS = re.compile(rb'\(extends\s+"([^"]+)"\)')
+_V6_HEADER = "(kicad_symbol_lib (version 20211014) (generator simple_skidl_parts)\n"
+_V6_FOOTER = "\n)\n"
+
+
+def _kicad_symbol_dirs() -> List[Path]:
+    dirs = [os.environ[v] for v in _SYMBOL_DIR_ENV_VARS if v in os.environ]
+    try:
+        from skidl import lib_search_paths, KICAD
+        dirs += lib_search_paths[KICAD]
+    except (ImportError, KeyError):
+        pass
+    return [Path(d) for d in dirs]
+
+
+def _kicad_footprint_dirs() -> List[Path]:
+    dirs = [os.environ[v] for v in _FOOTPRINT_DIR_ENV_VARS if v in os.environ]
+    try:
+        from skidl import footprint_search_paths, KICAD
+        dirs += footprint_search_paths[KICAD]
+    except (ImportError, KeyError):
+        pass
+    return [Path(d) for d in dirs]
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """
+    Writes through a uniquely named temporary file, so concurrent processes never see (or
+    write into) a partial file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False) as f:
+        f.write(text)
+    os.replace(f.name, path)
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    _write_atomic(path, json.dumps(data))
+
+
+def _read_json(path: Path) -> Dict:
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return stored if stored.get("version") == _INDEX_VERSION else {}
+
+
+def _scan_v5(buf) -> Dict[str, List]:
+    symbols = {}
+    for m in _V5_DEF.finditer(buf):
+        end = _V5_ENDDEF.search(buf, m.end())
+        if end is None:
+            break
+        entry = [m.start(), end.end(), None]
+        symbols[m.group(1).decode()] = entry
+        alias = _V5_ALIAS.search(buf, m.end(), end.start())
+        if alias:
+            for name in alias.group(1).split():
+                symbols.setdefault(name.decode(), entry)
+    return symbols
+
+
+def _scan_v6(buf) -> Dict[str, List]:
+    matches = list(_V6_SYMBOL.finditer(buf))
+    symbols = {}
+    for i, m in enumerate(matches):
+        end = matches[i+1].start() if i+1 < len(matches) else buf.rfind(b")")
+        extends = _V6_EXTENDS.search(buf, m.end(), end)
+        symbols[m.group(1).decode()] = [m.start(), end, extends.group(1).decode() if extends else None]
+    return symbols
+
+
+def _scan(path: Path) -> Dict[str, List]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return _scan_v5(buf) if path.suffix == _V5_SUFFIX else _scan_v6(buf)
+
+
+class SymbolIndex:
+    """
+    Symbol name to (library file, byte range) index over a set of KiCad symbol directories.
+    """
+    def __init__(self, dirs: Optional[Iterable] = None, cache_dir: Optional[Path] = None):
+        self.dirs = [Path(d) for d in dirs] if dirs is not None else _kicad_symbol_dirs()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else _CACHE_DIR
+        self.index_file = self.cache_dir / "symbol_index.json"
+        self.libs: Dict[str, Dict] = {}
+        self._by_lib_name: Dict[str, str] = {}
+        self.refresh()
+
+    def _lib_files(self) -> List[Path]:
+        files = []
+        for d in self.dirs:
+            if d.is_dir():
+                files += sorted(p for p in d.iterdir() if p.suffix in (_V5_SUFFIX, _V6_SUFFIX))
+        return files
+
+    def refresh(self) -> None:
+        """
+        Loads the index from disk and rescans any library that changed since it was stored.
+        """
+        stored_libs = _read_json(self.index_file).get("libs", {})
+
+        changed = False
+        self.libs = {}
+        self._by_lib_name = {}
+        for path in self._lib_files():
+            st = path.stat()
+            key = str(path)
+            entry = stored_libs.get(key)
+            if entry is None or entry["mtime"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                entry = {"mtime": st.st_mtime_ns, "size": st.st_size, "symbols": _scan(path)}
+                changed = True
+            self.libs[key] = entry
+            self._by_lib_name.setdefault(path.stem, key)
+        changed = changed or set(stored_libs) != set(self.libs)
+
+        if changed:
+            _write_json(self.index_file, {"version": _INDEX_VERSION, "libs": self.libs})
+
+    def locate(self, lib: str, name: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Returns the (library file, start, end) of the given symbol or None if it is not indexed.
+        """
+        path = self._by_lib_name.get(lib)
+        if path is None:
+            return None
+        entry = self.libs[path]["symbols"].get(name)
+        return (path, entry[0], entry[1]) if entry else None
+
+    def read_symbol(self, lib: str, name: str) -> Optional[str]:
+        """
+        Returns the definition of a single symbol (including the symbol it extends, if any)
+        without reading the rest of the library.
+        """
+        path = self._by_lib_name.get(lib)
+        entry = self.libs[path]["symbols"].get(name) if path else None
+        if entry is None:
+            return None
+        chunks = []
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            while entry is not None:
+                chunks.insert(0, buf[entry[0]:entry[1]].rstrip().decode())
+                parent = entry[2]
+                entry = self.libs[path]["symbols"].get(parent) if parent else None
+        return "\n".join(chunks)
+
+    def symbol_lib(self, lib: str, name: str) -> Optional[str]:
+        """
+        Returns the path of a library file that only contains the requested symbol, creating it
+        on first use. The file is named after the original library so the parts created from it
+        keep the same library name. Returns None if the symbol is not indexed.
+        """
+        located = self.locate(lib, name)
+        if located is None:
+            return None
+        path = Path(located[0])
+        digest = hashlib.sha1(f"{path}\0{self.libs[str(path)]['mtime']}\0{name}".encode()).hexdigest()[:16]
+        out = self.cache_dir / "symbols" / digest / path.name
+        if not out.exists():
+            text = self.read_symbol(lib, name)
+            header, footer = (_V5_HEADER, _V5_FOOTER) if path.suffix == _V5_SUFFIX else (_V6_HEADER, _V6_FOOTER)
+            _write_atomic(out, header + text + "\n" + footer)
+        return str(out)
+
+
+class FootprintIssue(NamedTuple):
+    footprint: Optional[str]
+    kind: str                 # "missing", "unknown" or "ambiguous"
+    refs: List[str]           # References of the parts using the footprint
+    suggestions: List[str]
+
+
+class FootprintIndex:
+    """
+    Footprint name to footprint libraries (.pretty directories) index.
+    """
+    def __init__(self, dirs: Optional[Iterable] = None, cache_dir: Optional[Path] = None):
+        self.dirs = [Path(d) for d in dirs] if dirs is not None else _kicad_footprint_dirs()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else _CACHE_DIR
+        self.index_file = self.cache_dir / "footprint_index.json"
+        self.libs: Dict[str, Dict] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        self.by_lib: Dict[str, set] = {}
+        self._by_first_token: Dict[str, List[str]] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Loads the index from disk and rescans the footprint libraries that changed (a .pretty
+        directory's mtime changes whenever a footprint is added, removed or renamed).
+        """
+        stored_libs = _read_json(self.index_file).get("libs", {})
+
+        changed = False
+        self.libs = {}
+        for d in self.dirs:
+            if not d.is_dir():
+                continue
+            for lib in sorted(p for p in d.iterdir() if p.suffix == _FOOTPRINT_LIB_SUFFIX and p.is_dir()):
+                key = str(lib)
+                mtime = lib.stat().st_mtime_ns
+                entry = stored_libs.get(key)
+                if entry is None or entry["mtime"] != mtime:
+                    names = sorted(f[:-len(_FOOTPRINT_SUFFIX)] for f in os.listdir(lib) if f.endswith(_FOOTPRINT_SUFFIX))
+                    entry = {"mtime": mtime, "footprints": names}
+                    changed = True
+                self.libs[key] = entry
+        if changed or set(stored_libs) != set(self.libs):
+            _write_json(self.index_file, {"version": _INDEX_VERSION, "libs": self.libs})
+
+        self.by_name = {}
+        self.by_lib = {}
+        for key, entry in self.libs.items():
+            nickname = Path(key).stem
+            if nickname in self.by_lib:
+                continue
+            self.by_lib[nickname] = set(entry["footprints"])
+            for name in entry["footprints"]:
+                self.by_name.setdefault(name, []).append(nickname)
+        self._by_first_token = {}
+        for name in self.by_name:
+            self._by_first_token.setdefault(name.split("_")[0], []).append(name)
+
+    def suggest(self, name: str, n: int = 3) -> List[str]:
+        """
+        Returns the closest known footprint names. Only names sharing the first token (e.g. "TO-220-3")
+        are compared unless there are none.
+        """
+        candidates = self._by_first_token.get(name.split("_")[0]) or list(self.by_name)
+        return difflib.get_close_matches(name, candidates, n=n, cutoff=0.6)
+
+    def check(self, footprint: Optional[str]) -> Optional[Tuple[str, List[str]]]:
+        """
+        Checks a single footprint. Returns None if it resolves to exactly one footprint, otherwise
+        the kind of issue and a list of suggestions.
+        """
+        if not footprint:
+            return "missing", []
+        lib, _, name = footprint.rpartition(":")
+        if lib:
+            if name in self.by_lib.get(lib, ()):
+                return None
+            return "unknown", [f"{l}:{s}" for s in self.suggest(name) for l in self.by_name[s]]
+        libs = self.by_name.get(name)
+        if libs is None:
+            return "unknown", self.suggest(name)
+        if len(libs) > 1:
+            return "ambiguous", [f"{l}:{name}" for l in libs]
+        return None
+
+
+def validate_footprints(circuit, index: Optional[FootprintIndex] = None) -> List[FootprintIssue]:
+    """
+    Checks the footprints of all the parts in the circuit against the footprint index in a
+    single pass. Each distinct footprint is only checked once.
+
+    Args:
+        circuit (Circuit): The circuit to check (e.g. default_circuit)
+        index (FootprintIndex, optional): Defaults to the process wide footprint index.
+
+    Returns:
+        List[FootprintIssue]: All the unknown, ambiguous and missing footprints
+    """
+    index = index or footprint_index()
+    refs_by_footprint: Dict[Optional[str], List[str]] = {}
+    for part in circuit.parts:
+        refs_by_footprint.setdefault(getattr(part, "footprint", None), []).append(part.ref)
+
+    issues = []
+    for footprint, refs in refs_by_footprint.items():
+        result = index.check(footprint)
+        if result is not None:
+            issues.append(FootprintIssue(footprint, result[0], refs, result[1]))
+    return issues
+
+
+@lru_cache(maxsize=None)
+def footprint_index() -> FootprintIndex:
+    """
+    Returns the process wide index of the KiCad footprint libraries.
+    """
+    return FootprintIndex()
+
+
+@lru_cache(maxsize=None)
+def symbol_index() -> SymbolIndex:
+    """
+    Returns the process wide index of the KiCad symbol libraries.
+    """
+    return SymbolIndex()
@@ -3,55 +3,173 @@ Implement utilities to support various BOM functions, e.g. automatic creation of
 provider specific BOM.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from pathlib import Path
+from functools import lru_cache
 import json
 import csv
 
-from skidl import Part
+from skidl import Part, NETLIST, TEMPLATE, KICAD
 from skidl.circuit import Circuit
+from skidl.netpinlist import NetPinList
+
+from .kicad_index import symbol_index
+from .circuit_context import current_circuit
 
 _JLCPCB_PREAMBLE = "JLCPCB:"
 
+# Process wide cache of part templates, keyed by (class, library, name, tool). The library
+# object (if not given by name) is kept alongside the template so its id cannot be reused.
+_PART_TEMPLATES: Dict[Tuple, Tuple[object, Part]] = {}
+
+# When set, library parts are created by calling it with (lib, name, **attribs) instead (see
+# spice_models.simulation_mode)
+_part_substitute = None
+
+@lru_cache(maxsize=None)
 def _read_parts_skus() -> Dict:
     d = Path(__file__).parent / "suggested_skus.json"
-    return json.load(open(d))
-    
+    with open(d) as f:
+        return json.load(f)
+
+
+def _template_pin_index(tmpl: Part) -> Tuple[int, Dict[str, Tuple[int, ...]]]:
+    """
+    Returns the number of pins of the template and the positions of its pins by number or name
+    (numbers first, as skidl looks them up). Ids that are also a pin alias are left out, so
+    they are always looked up by skidl.
+    """
+    aliases = {str(a) for pin in tmpl.pins for a in getattr(pin, "aliases", ())}
+    by_name: Dict[str, List[int]] = {}
+    by_num: Dict[str, List[int]] = {}
+    for i, pin in enumerate(tmpl.pins):
+        by_name.setdefault(str(pin.name), []).append(i)
+        by_num.setdefault(str(pin.num), []).append(i)
+    index = {key: tuple(pos) for key, pos in by_name.items()}
+    index.update((key, tuple(pos)) for key, pos in by_num.items())
+    return len(tmpl.pins), {key: pos for key, pos in index.items() if key not in aliases}
+
+
+def has_suggested_part(name: str, value: str) -> bool:
+    """
+    Whether the suggested parts list has the part (see TrackedPart), e.g. ("R", "4K7").
+    """
+    full = _read_parts_skus()
+    return f"{name} {value.split(' ')[0].replace('µ', 'u')}" in full or name in full
+
+
+def part_template(lib, name: str, tool=None, part_class: type = Part) -> Part:
+    """
+    Returns the template for the given library part. The library is only searched the first
+    time a (library, name) pair is requested in this process. KiCad libraries given by name
+    are resolved through the symbol index so only the requested symbol is parsed.
+
+    Args:
+        lib: Library name or SchLib object
+        name (str): The name of the part in the library
+        tool (optional): The tool the library belongs to (defaults to skidl's default tool)
+        part_class (type, optional): The class of the template (and of the copies made from it)
+
+    Returns:
+        Part: A part template (not part of any circuit)
+    """
+    key = (part_class, lib if isinstance(lib, str) else id(lib), name, tool)
+    if key not in _PART_TEMPLATES:
+        src = lib
+        if isinstance(lib, str) and tool in (None, KICAD):
+            src = symbol_index().symbol_lib(lib, name) or lib
+        tmpl = type.__call__(part_class, src, name, dest=TEMPLATE, tool=tool)
+        # Shared (not copied) by every part made from the template, see CachedPart.__getitem__
+        tmpl._pin_index = _template_pin_index(tmpl)
+        _PART_TEMPLATES[key] = (lib, tmpl)
+    return _PART_TEMPLATES[key][1]
+
+
+class _CachedPartType(type):
+    """
+    Metaclass routing the construction of library parts through the template cache, into the
+    circuit of the current context (see circuit_context). Anything that is not a plain library
+    part instantiation is constructed as usual.
+    """
+    def __call__(cls, lib=None, name=None, *args, dest=NETLIST, tool=None, **attribs):
+        if args or dest != NETLIST or lib is None or name is None or "connections" in attribs:
+            return super().__call__(lib, name, *args, dest=dest, tool=tool, **attribs)
+        attribs.setdefault("circuit", current_circuit())
+        if _part_substitute is not None:
+            return _part_substitute(lib, name, **attribs)
+        return cls._from_template(part_template(lib, name, tool, cls), **attribs)
+
+
+class CachedPart(Part, metaclass=_CachedPartType):
+    """
+    A skidl Part that is created by copying a cached library template instead of searching
+    the library every time.
+    """
+    @classmethod
+    def _from_template(cls, tmpl: Part, **attribs) -> Part:
+        return tmpl.copy(**attribs)
+
+    def __getitem__(self, *pin_ids, **criteria):
+        """
+        Looks up a single pin number or name of the template through the template's index of
+        pin positions, so skidl's linear search runs only for other ids (aliases, regexes,
+        several ids, criteria) or parts whose pins differ from their template's.
+        """
+        if criteria or len(pin_ids) != 1 or not isinstance(pin_ids[0], (str, int)) or self.match_pin_regex:
+            return super().__getitem__(*pin_ids, **criteria)
+        n_pins, index = getattr(self, "_pin_index", None) or (None, {})
+        positions = index.get(str(pin_ids[0])) if n_pins == len(self.pins) else None
+        if positions is None:
+            return super().__getitem__(*pin_ids)
+
+        if len(positions) == 1:
+            return self.pins[positions[0]]
+        return NetPinList([self.pins[i] for i in positions])
 
-class TrackedPart(Part):
+
+class TrackedPart(CachedPart):
     def __init__(self, *args, **kv):
         """
         This class wraps skidl's Part class to add some information that's only related to
         specific providers (e.g. part numbers)
         """
 
-        if "sku" in kv:
-            sku = kv.pop("sku")
-        else:
-            sku = None
-
+        sku = kv.pop("sku", None)
         super().__init__(*args, **kv)
 
         self.sku = sku
+        if sku is None and kv.get("dest", NETLIST) == NETLIST:
+            self._resolve_sku("footprint" in kv)
+
+    @classmethod
+    def _from_template(cls, tmpl: Part, sku: str = None, **attribs) -> Part:
+        part = super()._from_template(tmpl, **attribs)
+        part.sku = sku
         if sku is None:
-            val = self.value.split(" ")[0].replace("µ", "u")
-            key_long = f"{self.name} {val}"
-            key_short = f"{self.name}"
-            
-            full = _read_parts_skus()
-            if key_long in full:
-                all_parts = full[key_long]
-            elif key_short in full:
-                all_parts = full[key_short]
-            else:
-                assert False, f"Cannot find tracked part sku/footprint '{key_long}' '{key_short}'"
+            part._resolve_sku("footprint" in attribs)
+        return part
+
+    def _resolve_sku(self, has_footprint: bool) -> None:
+        """
+        Finds the sku (and the footprint, unless one was given) in the suggested parts list.
+        """
+        val = self.value.split(" ")[0].replace("µ", "u")
+        key_long = f"{self.name} {val}"
+        key_short = f"{self.name}"
+
+        full = _read_parts_skus()
+        if key_long in full:
+            all_parts = full[key_long]
+        elif key_short in full:
+            all_parts = full[key_short]
+        else:
+            assert False, f"Cannot find tracked part sku/footprint '{key_long}' '{key_short}'"
 
-            if "footprint" not in kv:
-                kv["footprint"] = self.footprint = all_parts[0]["footprint"]
+        if not has_footprint:
+            self.footprint = all_parts[0]["footprint"]
 
-            by_footprint = {k["footprint"]:k["sku"] for k in all_parts}
-            self.sku = by_footprint.get(kv["footprint"])
-            
+        by_footprint = {k["footprint"]:k["sku"] for k in all_parts}
+        self.sku = by_footprint.get(self.footprint)
 
 
 def _jlcpcb_line_gen(part:Part) -> List[str]:
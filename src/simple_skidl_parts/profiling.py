@@ -0,0 +1,185 @@
+"""
+Opt-in profiling of designs built with the library. While a profile is active every
+@subcircuit and @package function of the library is wrapped so each call records its wall
+time, the parts and nets it created and the memory it allocated (tracemalloc). Calls are kept
+as a tree that follows the design hierarchy:
+
+    with profile("irrigation") as root:
+        main()
+    write_json(root, "/tmp/irrigation_profile.json")
+    write_folded(root, "/tmp/irrigation.folded")    # flamegraph.pl / speedscope input
+
+Packages are built lazily (on ERC or netlist generation), so their nodes are attached to the
+subcircuit that called them and marked as deferred: their time is not part of the parent's.
+"""
+
+import functools
+import importlib
+import json
+import pkgutil
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from skidl import subcircuit
+from skidl.package import Package
+
+from . import circuit_context
+from .circuit_context import current_circuit
+
+# Every function made by @subcircuit shares the code of its wrapper (skidl's or the library's)
+_SUBCIRCUIT_CODES = (subcircuit(lambda: None).__code__, circuit_context.subcircuit(lambda: None).__code__)
+
+_STACK: List["ProfileNode"] = []
+
+
+class ProfileNode:
+    """
+    One (sub)circuit call. Values include everything that was built inside the call.
+    """
+    def __init__(self, name: str, deferred: bool = False):
+        self.name = name
+        self.deferred = deferred
+        self.time = 0.0       # s
+        self.parts = 0
+        self.nets = 0
+        self.memory = 0       # bytes still allocated when the call returned
+        self.children: List[ProfileNode] = []
+
+    def self_time(self) -> float:
+        return max(0.0, self.time - sum(c.time for c in self.children if not c.deferred))
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "deferred": self.deferred,
+            "time": self.time,
+            "parts": self.parts,
+            "nets": self.nets,
+            "memory": self.memory,
+            "children": [c.to_dict() for c in self.children],
+        }
+
+    def folded(self, prefix: str = "") -> List[str]:
+        """
+        Folded stacks ("root;child;grandchild <self time in µs>"), one line per node.
+        """
+        path = f"{prefix};{self.name}" if prefix else self.name
+        lines = [f"{path} {int(self.self_time()*1E+6)}"]
+        for c in self.children:
+            lines.extend(c.folded(path))
+        return lines
+
+
+class _Measure:
+    def __init__(self, node: ProfileNode, circuit):
+        self.node, self.circuit = node, circuit
+
+    def __enter__(self):
+        self.parts, self.nets = len(self.circuit.parts), len(self.circuit.nets)
+        self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        _STACK.append(self.node)
+        return self.node
+
+    def __exit__(self, *exc):
+        _STACK.pop()
+        self.node.time += time.perf_counter() - self.start
+        self.node.memory += tracemalloc.get_traced_memory()[0] - self.memory
+        self.node.parts += len(self.circuit.parts) - self.parts
+        self.node.nets += len(self.circuit.nets) - self.nets
+
+
+def _wrap(func: Callable, name: str, parent: Optional[ProfileNode] = None) -> Callable:
+    @functools.wraps(func)
+    def _profiled(*args, **kwargs):
+        if not _STACK:
+            return func(*args, **kwargs)
+        node = ProfileNode(name, deferred=parent is not None)
+        (parent or _STACK[-1]).children.append(node)
+        with _Measure(node, kwargs.get("circuit") or current_circuit()):
+            return func(*args, **kwargs)
+    return _profiled
+
+
+def _library_subcircuits() -> Tuple[Dict[int, Tuple[Callable, str]], Dict[int, str]]:
+    """
+    Imports every module of the library and returns its subcircuit functions and the
+    subcircuit functions of its packages (by id).
+    """
+    import simple_skidl_parts
+    funcs, packages = {}, {}
+    for info in pkgutil.walk_packages(simple_skidl_parts.__path__, "simple_skidl_parts."):
+        module = importlib.import_module(info.name)
+        for attr, value in vars(module).items():
+            if getattr(value, "__code__", None) in _SUBCIRCUIT_CODES:
+                funcs.setdefault(id(value), (value, attr))
+            elif isinstance(value, Package):
+                packages.setdefault(id(value.subcircuit), attr)
+    return funcs, packages
+
+
+@contextmanager
+def profile(name: str = "design"):
+    """
+    Profiles everything built inside the with block.
+
+    The library's subcircuits are rebound in every loaded module, including scripts that
+    imported them with "from ... import", and restored when the block ends.
+
+    Args:
+        name (str, optional): Name of the root node
+
+    Yields:
+        ProfileNode: The root of the call tree (filled when the block ends)
+    """
+    assert not _STACK, "A profile is already active"
+    funcs, packages = _library_subcircuits()
+    wrappers = {i: _wrap(f, attr) for i, (f, attr) in funcs.items()}
+
+    patched = []
+    for module in list(sys.modules.values()):
+        for attr, value in list(getattr(module, "__dict__", {}).items()):
+            if id(value) in wrappers and value is funcs[id(value)][0]:
+                setattr(module, attr, wrappers[id(value)])
+                patched.append((module, attr, value))
+
+    package_call = Package.__call__
+
+    def _profiled_package_call(self, *args, **kwargs):
+        pckg = package_call(self, *args, **kwargs)
+        if _STACK and id(self.subcircuit) in packages:
+            pckg.subcircuit = _wrap(self.subcircuit, packages[id(self.subcircuit)], parent=_STACK[-1])
+            # A Package is a dict backed Interface, so the attribute is also stored as an item
+            # that would be passed to the subcircuit as an argument. skidl drops it the same way.
+            if "subcircuit" in pckg:
+                del pckg["subcircuit"]
+        return pckg
+
+    Package.__call__ = _profiled_package_call
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    root = ProfileNode(name)
+    try:
+        with _Measure(root, current_circuit()):
+            yield root
+    finally:
+        Package.__call__ = package_call
+        for module, attr, value in patched:
+            setattr(module, attr, value)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def write_json(root: ProfileNode, filename: str) -> None:
+    with open(filename, "w") as f:
+        json.dump(root.to_dict(), f, indent=2)
+
+
+def write_folded(root: ProfileNode, filename: str) -> None:
+    with open(filename, "w") as f:
+        f.write("\n".join(root.folded()) + "\n")
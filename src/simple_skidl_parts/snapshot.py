@@ -0,0 +1,128 @@
+"""
+Compact binary snapshots of built circuits. A snapshot keeps the parts (with their pins, skus
+and place in the subcircuit hierarchy) and the nets, so BOMs, analysis or diffs can start from
+it without running the design code or reading KiCad libraries.
+
+The file is msgpack (pip install simple_skidl_parts[snapshot]). Every string is stored once
+in a table and referenced by its index, which keeps the repeated pin names, values and
+footprints of large boards small.
+"""
+
+import builtins
+from typing import Dict, List, Optional
+
+from skidl import Circuit, Net, Part, Pin, NETLIST, SKIDL
+from skidl.net import NCNet
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_SNAPSHOT_VERSION = 1
+
+
+class _Strings:
+    def __init__(self):
+        self.table: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def __call__(self, s) -> int:
+        if s is None:
+            return -1
+        s = str(s)
+        if s not in self.index:
+            self.index[s] = len(self.table)
+            self.table.append(s)
+        return self.index[s]
+
+
+def _check_msgpack():
+    if msgpack is None:
+        raise ImportError("Snapshots need msgpack: pip install simple_skidl_parts[snapshot]")
+
+
+def dumps(circuit: Optional[Circuit] = None) -> bytes:
+    """
+    Serializes a circuit (defaults to the default circuit).
+    """
+    _check_msgpack()
+    circ = circuit or builtins.default_circuit
+    s = _Strings()
+
+    positions = {}
+    parts = []
+    for part_idx, part in enumerate(circ.parts):
+        pins = []
+        for pin_idx, pin in enumerate(part.pins):
+            positions[id(pin)] = (part_idx, pin_idx)
+            pins.append([s(pin.num), s(pin.name), s(pin.func.name)])
+        parts.append([s(part.name), s(part.ref), s(part.value), s(part.footprint),
+                      s(getattr(part, "sku", None)), s(getattr(part, "hierarchy", None)), pins])
+
+    nets, nc, seen = [], [], set()
+    for net in circ.nets:
+        pins = [p for p in net.get_pins() if id(p) not in seen]
+        if not pins:
+            continue
+        seen.update(id(p) for p in pins)
+        connections = [list(positions[id(p)]) for p in pins]
+        if isinstance(net, NCNet):
+            nc.extend(connections)
+        else:
+            drive = max(int(n.drive) for n in net.nets)
+            nets.append([s(net.name), drive, connections])
+
+    return msgpack.packb({"version": _SNAPSHOT_VERSION, "strings": s.table,
+                          "parts": parts, "nets": nets, "nc": nc})
+
+
+def loads(data: bytes, circuit: Optional[Circuit] = None) -> Circuit:
+    """
+    Rebuilds a serialized circuit. The parts are created from their recorded pins (SKiDL tool
+    parts), so no library is read.
+
+    Args:
+        data (bytes): A snapshot made by dumps
+        circuit (Circuit, optional): Where to add the parts and nets. Defaults to a new circuit.
+
+    Returns:
+        Circuit: The circuit
+    """
+    _check_msgpack()
+    snap = msgpack.unpackb(data)
+    assert snap["version"] == _SNAPSHOT_VERSION, f"Unsupported snapshot version {snap['version']}"
+    strings = snap["strings"]
+
+    def s(i: int) -> Optional[str]:
+        return None if i < 0 else strings[i]
+
+    circ = circuit or Circuit()
+
+    parts = []
+    for name, ref, value, footprint, sku, hierarchy, pins in snap["parts"]:
+        part = Part(tool=SKIDL, name=s(name), dest=NETLIST, circuit=circ, ref=s(ref),
+                    value=s(value), footprint=s(footprint),
+                    pins=[Pin(num=s(num), name=s(pin_name), func=Pin.types[s(func)]) for num, pin_name, func in pins])
+        part.sku = s(sku)
+        if hierarchy >= 0:
+            part.hierarchy = s(hierarchy)
+        parts.append(part)
+
+    for name, drive, connections in snap["nets"]:
+        net = Net(s(name), circuit=circ)
+        net.drive = Pin.drives(drive)
+        net += [parts[p].pins[i] for p, i in connections]
+    for p, i in snap["nc"]:
+        parts[p].pins[i] += circ.NC
+    return circ
+
+
+def save_snapshot(filename: str, circuit: Optional[Circuit] = None) -> None:
+    with open(filename, "wb") as f:
+        f.write(dumps(circuit))
+
+
+def load_snapshot(filename: str, circuit: Optional[Circuit] = None) -> Circuit:
+    with open(filename, "rb") as f:
+        return loads(f.read(), circuit)
@@ -0,0 +1,96 @@
+"""
+Batch SPICE verification. A job builds a circuit with skidl's SPICE parts, runs one analysis
+on it with ngspice and returns the node voltages and branch currents as NumPy arrays. Jobs run
+in a process pool and results are cached on disk, keyed by the hash of the generated netlist
+and the analysis, so unchanged circuits are not simulated again:
+
+    jobs = [SpiceJob(rpp_bench, {"input_voltage": v}, "dc", {"VS": (-24, 24, 0.1)}) for v in (12, 24)]
+    for res in run_spice_jobs(jobs):
+        assert np.all((res["v-sweep"] > 0) | (np.abs(res["vs"]) < 1E-5))
+
+Builders must be module level functions (they are sent to the worker processes by name).
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .kicad_index import _CACHE_DIR
+
+SPICE_CACHE_DIR = _CACHE_DIR / "spice"
+
+
+class SpiceJob(NamedTuple):
+    builder: Callable[..., None]    # Builds the circuit in the default circuit, called with params
+    params: Dict
+    analysis: str                   # "dc", "operating_point" or "transient"
+    analysis_args: Dict             # e.g. {"VS": (start, stop, step)} for "dc"
+
+
+def _simulate(circ, analysis: str, args: Dict) -> Dict[str, np.ndarray]:
+    sim = circ.simulator()
+    if analysis == "dc":
+        res = sim.dc(**{src: slice(*sweep) for src, sweep in args.items()})
+    elif analysis == "operating_point":
+        res = sim.operating_point(**args)
+    elif analysis == "transient":
+        res = sim.transient(**args)
+    else:
+        raise NotImplementedError(f"Analysis {analysis} is not supported")
+
+    arrays = {name: np.array(v) for name, v in res.branches.items()}
+    arrays.update({name: np.array(v) for name, v in res.nodes.items()})
+    if analysis == "transient":
+        arrays["time"] = np.array(res.time)
+    return arrays
+
+
+def _run_job(job: SpiceJob, cache_dir: Optional[Path]) -> Dict[str, np.ndarray]:
+    from skidl import generate_netlist, reset
+
+    reset()
+    job.builder(**job.params)
+    circ = generate_netlist()
+
+    h = hashlib.sha256(str(circ).encode())
+    h.update(json.dumps([job.analysis, job.analysis_args], sort_keys=True, default=repr).encode())
+    cache_file = Path(cache_dir) / f"{h.hexdigest()}.npz" if cache_dir else None
+    if cache_file and cache_file.exists():
+        with np.load(cache_file) as cached:
+            return dict(cached)
+
+    arrays = _simulate(circ, job.analysis, job.analysis_args)
+    if cache_file:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Jobs with the same netlist may run concurrently, each writes its own temporary file
+        with tempfile.NamedTemporaryFile(dir=cache_file.parent, suffix=".tmp", delete=False) as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(f.name, cache_file)
+    return arrays
+
+
+def run_spice_jobs(jobs: List[SpiceJob], processes: Optional[int] = None,
+                   cache_dir: Optional[Path] = SPICE_CACHE_DIR) -> List[Dict[str, np.ndarray]]:
+    """
+    Simulates all the jobs in parallel.
+
+    Args:
+        jobs (List[SpiceJob]): The jobs
+        processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        cache_dir (Path, optional): Where results are cached, None disables the cache
+
+    Returns:
+        List[Dict[str, np.ndarray]]: Per job (in order), the arrays of every node and branch
+        by name (and "time" for transient analyses)
+    """
+    # ngspice keeps global state, so the workers are fresh interpreters rather than forks
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(processes, mp_context=ctx) as pool:
+        return list(pool.map(_run_job, jobs, [cache_dir] * len(jobs)))
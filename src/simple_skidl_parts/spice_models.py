@@ -0,0 +1,119 @@
+"""
+SPICE models of the library's parts. The registry maps (library, part name, value) to a model,
+either a part of a SPICE model library or one of skidl's SPICE primitives (R, C, L). Inside
+simulation_mode() every CachedPart/TrackedPart is created from its model instead of the KiCad
+library, so any subcircuit can be built for simulation as is:
+
+    with simulation_mode():
+        rpol = reverse_polarity_protection(max_current=2, input_voltage=25)
+        ...
+        circ = generate_netlist()
+
+Model libraries are parsed once per process.
+"""
+
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from rkm_codes import from_rkm
+
+from . import parts_wrapper
+
+SPICE_LIB_DIR = os.environ.get("SSP_SPICE_LIB_DIR", "SpiceLib")
+
+
+class SpiceModel(NamedTuple):
+    lib: Optional[str]                  # SPICE library file, None for a skidl SPICE primitive
+    name: str                           # Model name in the library (or the primitive, e.g. "R")
+    pin_aliases: Tuple[Tuple[int, str], ...] = ()  # (pin number, the name the KiCad symbol uses)
+
+
+_REGISTRY: Dict[Tuple[str, Optional[str], Optional[str]], SpiceModel] = {}
+
+
+def register_spice_model(lib: str, name: Optional[str], model: SpiceModel, value: Optional[str] = None) -> None:
+    """
+    Registers the model of a library part. name and value may be None to match any.
+    """
+    _REGISTRY[(lib, name, value)] = model
+
+
+def spice_model(lib: str, name: str, value: Optional[str] = None) -> Optional[SpiceModel]:
+    """
+    Finds the model of a part, the most specific registration first.
+    """
+    for key in ((lib, name, value), (lib, name, None), (lib, None, None)):
+        if key in _REGISTRY:
+            return _REGISTRY[key]
+    return None
+
+
+_P_FET = SpiceModel("ph_fet.lib", "BS250_PH", ((1, "D"), (2, "G"), (3, "S")))
+_RECTIFIER = SpiceModel("on_rect.lib", "1n4001rl")
+
+register_spice_model("Transistor_FET", "AO3401A", _P_FET)
+register_spice_model("Transistor_FET", "IRF9540N", _P_FET)
+register_spice_model("Diode", "ZMMxx", SpiceModel("m_zener.lib", "mmqa5v6t1"), value="ZMM5V6")
+register_spice_model("Diode", "SM4007", _RECTIFIER)
+register_spice_model("Device", "D", _RECTIFIER)
+register_spice_model("Device", "R", SpiceModel(None, "R"))
+register_spice_model("Device", "C", SpiceModel(None, "C"))
+register_spice_model("Device", "L", SpiceModel(None, "L"))
+
+
+@lru_cache(maxsize=None)
+def _model_template(model: SpiceModel):
+    from skidl import Part, SchLib, TEMPLATE, lib_search_paths, SPICE
+
+    if SPICE_LIB_DIR not in lib_search_paths[SPICE]:
+        lib_search_paths[SPICE].append(SPICE_LIB_DIR)
+    tmpl = Part(SchLib(model.lib, tool=SPICE), model.name, dest=TEMPLATE, tool=SPICE)
+    for num, alias in model.pin_aliases:
+        tmpl[num].aliases += [alias]
+    return tmpl
+
+
+def _value(value: str) -> float:
+    # Values of tracked parts look like "4K7", "100n" or "10u 50V"
+    return from_rkm(value.split(" ")[0].replace("µ", "u"))
+
+
+def spice_part(lib, name: str, value: Optional[str] = None, circuit=None, **attribs):
+    """
+    Creates the SPICE equivalent of a library part (in the given circuit).
+
+    Raises:
+        NotImplementedError: If the part has no registered model
+    """
+    lib_name = lib if isinstance(lib, str) else Path(getattr(lib, "filename", "")).stem
+    model = spice_model(lib_name, name, value)
+    if model is None:
+        raise NotImplementedError(f"No SPICE model for {lib_name}:{name} ({value})")
+    if model.lib is None:
+        import skidl.pyspice
+        primitive = getattr(skidl.pyspice, model.name)
+        return primitive(value=_value(value), circuit=circuit) if value else primitive(circuit=circuit)
+    return _model_template(model).copy(circuit=circuit)
+
+
+@contextmanager
+def simulation_mode():
+    """
+    Creates every CachedPart/TrackedPart from its SPICE model while active.
+    """
+    from skidl import SPICE, get_default_tool, set_default_tool
+
+    previous_tool = get_default_tool()
+    import skidl.pyspice  # Makes SPICE the default tool (on the first import)
+    set_default_tool(SPICE)
+
+    previous = parts_wrapper._part_substitute
+    parts_wrapper._part_substitute = spice_part
+    try:
+        yield
+    finally:
+        parts_wrapper._part_substitute = previous
+        set_default_tool(previous_tool)
@@ -0,0 +1,221 @@
+"""
+Memoize the structure of subcircuits that are instantiated many times with the same parameters
+(e.g. one triac switch per valve or one LED per status signal). The first call builds the
+subcircuit normally and records the parts it created and how their pins are connected. Later
+calls with the same parameters stamp out copies of the recorded parts and wire them the same way,
+skipping value calculations, SKU lookups and library searches.
+"""
+
+import functools
+import inspect
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from skidl import Net, Pin, TEMPLATE
+from skidl.net import NCNet
+
+from . import parts_wrapper
+from .circuit_context import current_circuit
+
+# Nets without an explicit name get an automatic one with this prefix. Those are not copied to
+# the stamped nets since skidl will name them anyway.
+_AUTO_NET_PREFIX = "N$"
+
+# A recorded slot is one of:
+#   ("arg", name)       - connected to the interface net/pin passed as argument `name`
+#   ("net", idx)        - connected to the idx-th net created inside the subcircuit
+#   ("nc", None)        - explicitly not connected
+_Slot = Tuple[str, object]
+
+# Sentinel for calls that cannot be stamped (e.g. the subcircuit touches global nets).
+_UNCACHEABLE = object()
+
+_CACHE: Dict[Tuple, object] = {}
+
+
+class _Template:
+    """
+    The recorded structure of a single subcircuit build.
+    """
+    def __init__(self, parts, refs, connections, nets, joins, drives):
+        self.parts = parts              # Part templates, in creation order
+        self.refs = refs                # Explicit ref of each part (None for automatic ones)
+        self.connections = connections  # [(part index, pin index, slot)]
+        self.nets = nets                # [(name or None, drive)] for nets created inside
+        self.joins = joins              # [(arg name, arg name)] interface nets joined together
+        self.drives = drives            # {arg name: drive} for interface nets driven inside
+
+    def stamp(self, interface: Dict, circ) -> None:
+        # Copies get automatic refs, so the explicit ones are given again
+        parts = [tmpl(circuit=circ, ref=ref) if ref else tmpl(circuit=circ)
+                 for tmpl, ref in zip(self.parts, self.refs)]
+        nets: List[Optional[Net]] = [None] * len(self.nets)
+
+        for a, b in self.joins:
+            if not _is_attached(interface[a], interface[b]):
+                interface[a] += interface[b]
+        for a, drive in self.drives.items():
+            interface[a].drive = max(interface[a].drive, drive)
+
+        for part_idx, pin_idx, (kind, what) in self.connections:
+            pin = parts[part_idx].pins[pin_idx]
+            if kind == "arg":
+                pin += interface[what]
+            elif kind == "nc":
+                pin += circ.NC
+            else:
+                if nets[what] is None:
+                    name, drive = self.nets[what]
+                    nets[what] = Net(name, circuit=circ) if name else Net(circuit=circ)
+                    nets[what].drive = drive
+                pin += nets[what]
+
+
+def _is_attached(a, b) -> bool:
+    return a is b or a.is_attached(b)
+
+
+def _explicit_ref(part) -> Optional[str]:
+    """
+    The ref the part was given explicitly, None if skidl numbered it (e.g. R12).
+    """
+    if re.fullmatch(re.escape(part.ref_prefix) + r"\d+", part.ref):
+        return None
+    return part.ref
+
+
+def _is_interface(value) -> bool:
+    return isinstance(value, (Net, Pin))
+
+
+def _cache_key(func: Callable, bound: inspect.BoundArguments) -> Optional[Tuple]:
+    params = []
+    handles = []
+    for name, value in bound.arguments.items():
+        if _is_interface(value):
+            # Keyed by the first interface argument it is attached to, so a call that gets the
+            # same net twice is never stamped into one with distinct nets (or vice versa)
+            alias = next((i for i, h in enumerate(handles) if _is_attached(h, value)), len(handles))
+            handles.append(value)
+            params.append((name, ("net", alias)))
+            continue
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        params.append((name, value))
+    # Recordings made with real parts must not be stamped in simulation mode (and vice versa)
+    return (func.__module__, func.__qualname__, tuple(params), parts_wrapper._part_substitute)
+
+
+def _record(circ, n_parts: int, n_packages: int, interface: Dict, joined_before: set,
+            drives_before: Dict) -> object:
+    """
+    Records what the subcircuit added to the circuit since it had `n_parts` parts. Returns
+    _UNCACHEABLE if the subcircuit did something that cannot be replayed from its parameters.
+    """
+    if len(getattr(circ, "packages", ())) != n_packages:
+        # Nested packages are instantiated lazily and would be missed by the recording.
+        return _UNCACHEABLE
+
+    new_parts = circ.parts[n_parts:]
+    part_ids = {id(p) for p in new_parts}
+    net_slots: Dict[int, int] = {}
+    nets = []
+    connections = []
+
+    for part_idx, part in enumerate(new_parts):
+        for pin_idx, pin in enumerate(part.pins):
+            net = pin.net
+            if net is None:
+                continue
+            if isinstance(net, NCNet):
+                connections.append((part_idx, pin_idx, ("nc", None)))
+                continue
+            arg = next((name for name, handle in interface.items() if handle.is_attached(net)), None)
+            if arg is not None:
+                connections.append((part_idx, pin_idx, ("arg", arg)))
+                continue
+            if id(net) not in net_slots:
+                if any(id(p.part) not in part_ids for p in net.get_pins()):
+                    # Connected to something that is neither an argument nor created here.
+                    return _UNCACHEABLE
+                for n in net.nets:
+                    net_slots[id(n)] = len(nets)
+                name = None if net.name.startswith(_AUTO_NET_PREFIX) else net.name
+                nets.append((name, net.drive))
+            connections.append((part_idx, pin_idx, ("net", net_slots[id(net)])))
+
+    names = list(interface)
+    joins = [(a, b) for i, a in enumerate(names) for b in names[i+1:]
+             if (a, b) not in joined_before and _is_attached(interface[a], interface[b])]
+    drives = {name: interface[name].drive for name in names
+              if isinstance(interface[name], Net) and interface[name].drive != drives_before[name]}
+
+    parts = [p.copy(dest=TEMPLATE) for p in new_parts]
+    return _Template(parts, [_explicit_ref(p) for p in new_parts], connections, nets, joins, drives)
+
+
+def memoize_subcircuit(func: Callable) -> Callable:
+    """
+    Decorator for subcircuit functions that only create parts and connect them to the nets/pins
+    they receive as arguments. Put it below the @subcircuit decorator so that the hierarchy is
+    still handled by it. skidl's @package takes the package's interface from the signature of the
+    function it decorates, so a package calls a memoized function from its body instead.
+
+    Calls are keyed by all the non Net/Pin arguments and by which of the Net/Pin arguments are
+    attached to each other. Functions that return a value, instantiate
+    nested packages or connect to nets they did not get as arguments are never stamped and
+    always run normally.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = _cache_key(func, bound)
+        cached = _CACHE.get(key) if key is not None else _UNCACHEABLE
+
+        interface = {name: v for name, v in bound.arguments.items() if _is_interface(v)}
+        circ = current_circuit()
+        if isinstance(cached, _Template):
+            cached.stamp(interface, circ)
+            return None
+
+        n_parts = len(circ.parts)
+        n_packages = len(getattr(circ, "packages", ()))
+        names = list(interface)
+        joined_before = {(a, b) for i, a in enumerate(names) for b in names[i+1:]
+                         if _is_attached(interface[a], interface[b])}
+        drives_before = {name: getattr(v, "drive", None) for name, v in interface.items()}
+
+        result = func(*args, **kwargs)
+
+        if cached is None:
+            _CACHE[key] = _UNCACHEABLE if result is not None else \
+                _record(circ, n_parts, n_packages, interface, joined_before, drives_before)
+        return result
+
+    return wrapper
+
+
+def invalidate_subcircuit_cache(modules: Iterable[str]) -> int:
+    """
+    Forget the recorded subcircuits defined in the given modules (e.g. after reloading them).
+
+    Returns:
+        int: The number of forgotten recordings
+    """
+    modules = set(modules)
+    stale = [key for key in _CACHE if key[0] in modules]
+    for key in stale:
+        del _CACHE[key]
+    return len(stale)
+
+
+def clear_subcircuit_cache() -> None:
+    """
+    Forget all recorded subcircuits (e.g. after changing the library code or the SKU list).
+    """
+    _CACHE.clear()
@@ -0,0 +1,80 @@
+"""
+Build many variants of a design that share a common base. The base (libraries, shared nets
+and parts) is built once in this process, then every variant runs in a process forked from
+it, so it starts with a copy-on-write copy of the base instead of rebuilding it:
+
+    def base():
+        gnd, vin, vout = Net("GND"), Net("VIN"), Net("VOUT")
+        return gnd, vin, vout
+
+    def variant(nets, params):
+        gnd, vin, vout = nets
+        buck_step_down_exact_input(vin, vout, gnd, *params)
+
+    netlists = build_variants(base, variant, product([5, 12, 24], [3.3, 5], [0.5, 1.0]))
+
+Where fork is not available the variants are built one after the other, rebuilding the base
+for each of them.
+"""
+
+import io
+import multiprocessing
+from typing import Any, Callable, Iterable, List, Optional
+
+from skidl import generate_netlist, reset
+
+# The job of the current build_variants call. Set before the workers are forked, so they get
+# it (and the base circuit) without pickling.
+_JOB = None
+
+
+def _build_netlist(state, variant: Callable[[Any, Any], None], params) -> str:
+    variant(state, params)
+    netlist = io.StringIO()
+    generate_netlist(file_=netlist)
+    return netlist.getvalue()
+
+
+def _run_variant(idx: int) -> str:
+    state, variant, params = _JOB
+    return _build_netlist(state, variant, params[idx])
+
+
+def build_variants(base: Callable[[], Any], variant: Callable[[Any, Any], None], params: Iterable,
+                   processes: Optional[int] = None) -> List[str]:
+    """
+    Builds the base circuit once and one netlist per variant parameter.
+
+    Args:
+        base (Callable[[], Any]): Builds the shared part of the design in the default circuit and
+            returns whatever the variants need (e.g. nets)
+        variant (Callable[[Any, Any], None]): Called as variant(base result, params) to add a
+            variant to the base circuit
+        params (Iterable): The parameters of each variant
+        processes (int, optional): Number of variants built at the same time. Defaults to the
+            number of CPUs.
+
+    Returns:
+        List[str]: The netlists, in the order of params
+    """
+    global _JOB
+    params = list(params)
+    reset()
+    state = base()
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        netlists = []
+        for p in params:
+            if netlists:
+                reset()
+                state = base()
+            netlists.append(_build_netlist(state, variant, p))
+        return netlists
+
+    _JOB = (state, variant, params)
+    try:
+        # One variant per worker: every worker is forked from this process with the pristine base
+        with multiprocessing.get_context("fork").Pool(processes, maxtasksperchild=1) as pool:
+            return pool.map(_run_variant, range(len(params)), chunksize=1)
+    finally:
+        _JOB = None
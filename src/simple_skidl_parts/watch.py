@@ -0,0 +1,196 @@
+"""
+Watch mode: rebuilds a design script whenever it or a library module changes.
+
+    ssp-watch examples/irrigation_esp32_24v_ac.py
+
+The process stays alive between builds, so everything cached per process is kept. When a
+library module changes, that module and the modules that use it are reloaded and only their
+recorded subcircuits (see subcircuit_cache) are forgotten. Every other memoized subcircuit
+is stamped from its recording on the next build. The script runs again from scratch, so it
+regenerates its netlist and BOM.
+
+This only partially realizes rebuilding just the affected subcircuits. The script always runs
+in full, and only the memoized subcircuits (led_simple and optocoupled_triac_switch) skip their
+work. Everything else, the power tree included, is built again on every change. What a rebuild
+saves is the interpreter start, the imports and the per process caches (templates, libraries).
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Set
+
+from skidl.package import Package
+
+from . import parts_wrapper, subcircuit_cache
+from .daemon import run_script
+
+_LIBRARY_DIR = Path(__file__).parent
+_PACKAGE = __name__.rsplit(".", 1)[0]
+# These hold the watcher's own state and are never reloaded
+_NOT_RELOADED = {__name__, f"{_PACKAGE}.daemon"}
+
+
+def _library_modules() -> Dict[str, ModuleType]:
+    return {name: m for name, m in list(sys.modules.items())
+            if name.startswith(_PACKAGE + ".") and getattr(m, "__file__", None) and name not in _NOT_RELOADED}
+
+
+def _origin_modules(value, depth: int = 3) -> Set[str]:
+    """
+    The modules a global of a module comes from, looking through decorators (including skidl's
+    @subcircuit and @package wrappers, which don't keep the name of the function they wrap).
+    """
+    if isinstance(value, ModuleType):
+        return {value.__name__}
+    if isinstance(value, Package):
+        value = value.subcircuit
+    found = set()
+    module = getattr(value, "__module__", None)
+    if isinstance(module, str):
+        found.add(module)
+    if depth and callable(value):
+        for cell in getattr(value, "__closure__", None) or ():
+            try:
+                found |= _origin_modules(cell.cell_contents, depth-1)
+            except ValueError:  # Empty cell
+                pass
+    return found
+
+
+def _dependencies(modules: Dict[str, ModuleType]) -> Dict[str, Set[str]]:
+    deps = {}
+    for name, module in modules.items():
+        used = set()
+        for value in list(vars(module).values()):
+            # Importing a submodule sets it as an attribute of its package, that is not a use
+            if isinstance(value, ModuleType) and value.__name__.startswith(name + "."):
+                continue
+            used |= _origin_modules(value)
+        deps[name] = {m for m in used if m in modules and m != name}
+    return deps
+
+
+class Watcher:
+    """
+    Tracks the modification times of a script, the library's modules and its data files.
+    """
+    def __init__(self, script: str):
+        self.script = Path(script).resolve()
+        self.mtimes = self._scan()
+
+    def _files(self) -> List[Path]:
+        files = [self.script]
+        files += [Path(m.__file__).resolve() for m in _library_modules().values()]
+        files += sorted(_LIBRARY_DIR.rglob("*.json"))
+        return files
+
+    def _scan(self) -> Dict[Path, float]:
+        mtimes = {}
+        for f in self._files():
+            try:
+                mtimes[f] = f.stat().st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def changed(self) -> List[Path]:
+        mtimes = self._scan()
+        changed = [f for f, t in mtimes.items() if self.mtimes.get(f) != t]
+        self.mtimes = mtimes
+        return changed
+
+    def reload(self, changed: List[Path]) -> List[str]:
+        """
+        Reloads the changed library modules and everything that depends on them (dependencies
+        first) and forgets their recorded subcircuits. A changed data file reloads the whole
+        library since it is not known which module reads it.
+
+        Returns:
+            List[str]: The reloaded modules
+        """
+        modules = _library_modules()
+        by_file = {Path(m.__file__).resolve(): name for name, m in modules.items()}
+        if any(f.suffix == ".json" for f in changed):
+            stale = set(modules)
+        else:
+            stale = {by_file[f] for f in changed if f in by_file}
+        if not stale:
+            return []
+
+        deps = _dependencies(modules)
+        dependents: Dict[str, Set[str]] = {name: set() for name in modules}
+        for name, used in deps.items():
+            for d in used:
+                dependents[d].add(name)
+        todo = list(stale)
+        while todo:
+            for d in dependents[todo.pop()] - stale:
+                stale.add(d)
+                todo.append(d)
+
+        order: List[str] = []
+        visited: Set[str] = set()     # Also guards against import cycles
+        def _visit(name):
+            if name in visited:
+                return
+            visited.add(name)
+            for d in sorted(deps[name] & stale):
+                _visit(d)
+            order.append(name)
+        for name in sorted(stale):
+            _visit(name)
+
+        for name in order:
+            importlib.reload(modules[name])
+        subcircuit_cache.invalidate_subcircuit_cache(order)
+        parts_wrapper._read_parts_skus.cache_clear()
+        return order
+
+
+def build(script: str) -> bool:
+    res = run_script(script)
+    sys.stdout.write(res["output"])
+    if res["error"]:
+        sys.stderr.write(res["error"])
+    print(f"Built {script} in {res['time']:.2f}s")
+    return res["ok"]
+
+
+def watch(script: str, interval: float = 0.5) -> None:
+    """
+    Builds the script, then rebuilds it on every change until interrupted.
+    """
+    build(script)
+    watcher = Watcher(script)
+    try:
+        while True:
+            time.sleep(interval)
+            changed = watcher.changed()
+            if not changed:
+                continue
+            print(f"Changed: {', '.join(f.name for f in changed)}")
+            reloaded = watcher.reload(changed)
+            if reloaded:
+                print(f"Reloaded: {', '.join(reloaded)}")
+            build(script)
+            # Modules imported for the first time by the new build are watched from now on
+            watcher.mtimes = watcher._scan()
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild a design script when it or the library changes")
+    parser.add_argument("script")
+    parser.add_argument("-i", "--interval", type=float, default=0.5, help="Polling interval (s)")
+    args = parser.parse_args(argv)
+    watch(args.script, args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
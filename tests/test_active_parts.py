@@ -0,0 +1,33 @@
+import pytest
+
+from simple_skidl_parts.analog.active_parts import select_mosfet, select_diode, select_regulator
+from simple_skidl_parts.catalog import Catalog
+
+@pytest.mark.parametrize("v_gate,current,expected", [(3.3, 1, "AO3400A"), (5, 10, "IRLZ44N"), (3.3, 10, "IRLIZ44N"), (2.0, 1, None)])
+def test_logic_mosfet(v_gate, current, expected):
+    row = select_mosfet("N", v_gate=v_gate, current=current)
+    assert (row and row["value"]) == expected
+
+@pytest.mark.parametrize("current,voltage,expected", [(3.9, 24, "AO3401A"), (4.0, 24, "IRF9540N"), (1, 30, "IRF9540N")])
+def test_reverse_polarity_mosfet_is_strict(current, voltage, expected):
+    assert select_mosfet("P", current=current, voltage=voltage, strict=True)["value"] == expected
+
+def test_mosfet_packages():
+    assert select_mosfet("N", v_gate=3.3, current=4, packages=("TO-220",))["value"] == "IRLIZ44N"
+    assert select_mosfet("N", v_gate=3.3, current=30, packages=("TO-220",))["value"] == "IRLIZ44N"
+
+@pytest.mark.parametrize("current,voltage,expected", [(0.5, 12, "B5819W"), (2, 12, "SS54"), (2, 45, "SS36-E3/57T"), (4, 45, None)])
+def test_schottky(current, voltage, expected):
+    row = select_diode("schottky", current=current, voltage=voltage)
+    assert (row and row["value"]) == expected
+
+def test_regulator():
+    assert select_regulator("linear", vout=3.3, vin=5.5, current=0.5)["value"] == "AMS1117-3.3"
+    assert select_regulator("linear", vout=3.3, vin=20) is None
+    assert select_regulator("linear", vout=5.0, vin=16, current=0.5)["value"] == "LM78M05_TO252"
+
+def test_catalog_query_order():
+    cat = Catalog([{"price": p, "x": x, "k": k} for p, x, k in [(3, 1, "a"), (1, 5, "a"), (2, 7, "b"), (0.5, 2, "b")]])
+    assert [r["price"] for r in cat.query(mins={"x": 2})] == [0.5, 1, 2]
+    assert [r["price"] for r in cat.query(equals={"k": "a"}, maxs={"x": 5})] == [1, 3]
+    assert cat.cheapest(equals={"k": "c"}) is None
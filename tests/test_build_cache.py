@@ -0,0 +1,26 @@
+from skidl import *
+
+from simple_skidl_parts.analog.vdiv import vdiv
+from simple_skidl_parts.build_cache import BuildStore, cached_build
+
+builds = []
+
+def _design(ratio):
+    builds.append(ratio)
+    vdiv(Net("VIN"), Net("OUT"), Net("GND"), ratio=ratio, rtot=1.2E+6)  # Values with suggested SKUs
+
+def test_builds_are_cached(tmp_path):
+    store = BuildStore(tmp_path)
+    first = cached_build(_design, {"ratio": 1.0}, store=store)
+    second = cached_build(_design, {"ratio": 1.0}, store=store)
+    assert builds == [1.0]
+    assert not first.cached and second.cached
+    assert first.netlist == second.netlist and first.bom == second.bom
+
+    cached_build(_design, {"ratio": 2.0}, store=store)
+    assert builds == [1.0, 2.0]
+
+def test_eviction(tmp_path):
+    store = BuildStore(tmp_path, max_bytes=1)
+    cached_build(_design, {"ratio": 3.0}, store=store)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,17 @@
+import pytest
+
+from simple_skidl_parts.analog.capacitors import select_capacitor
+
+@pytest.mark.parametrize("capacitance,voltage,kv,expected", [
+    (1E-6, 24, {}, "JLCPCB:C28323"),
+    (1E-6, 30, {}, None),                           # X7R derated to 25V
+    (1E-6, 30, {"derating": 0.8}, "JLCPCB:C28323"),
+    (10E-6, 12, {}, "JLCPCB:C15850"),
+    (10E-6, 12, {"dielectric": "C0G"}, None),
+    (470E-6, 35, {"polarized": True}, "JLCPCB:C178551"),
+    (470E-6, 45, {"polarized": True}, None),
+    (100.5E-12, 5, {}, "JLCPCB:C1790"),
+])
+def test_select_capacitor(capacitance, voltage, kv, expected):
+    row = select_capacitor(capacitance, voltage, **kv)
+    assert (row and row["sku"]) == expected
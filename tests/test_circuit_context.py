@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from skidl import *
+
+from simple_skidl_parts.analog.vdiv import vdiv
+from simple_skidl_parts.circuit_context import current_circuit, use_circuit
+
+def _build(ratio: float):
+    with use_circuit() as circ:
+        gnd, vin = Net("GND", circuit=circ), Net("VIN", circuit=circ)
+        outs = [Net(f"OUT{i}", circuit=circ) for i in range(10)]
+        for out in outs:
+            vdiv(vin, out, gnd, ratio=ratio, rtot=1.2E+6)  # Values with suggested SKUs
+        assert current_circuit() is circ
+        return circ
+
+def test_use_circuit_scopes_the_builders():
+    reset()
+    with use_circuit() as circ:
+        vdiv(Net("VIN", circuit=circ), Net("OUT", circuit=circ), Net("GND", circuit=circ), rtot=1.2E+6)
+    assert current_circuit() is default_circuit
+    assert len(circ.parts) == 2 and not default_circuit.parts
+    assert all(p.circuit is circ for p in circ.parts)
+
+def test_concurrent_builds():
+    reset()
+    with ThreadPoolExecutor(4) as pool:
+        circuits = list(pool.map(_build, [1.0, 2.0, 1.0, 3.0]))
+    assert not default_circuit.parts
+    for circ in circuits:
+        assert len(circ.parts) == 20
+        assert {p.circuit for p in circ.parts} == {circ}
+        gnd = next(n for n in circ.nets if n.name == "GND")
+        assert len(gnd.get_pins()) == 10
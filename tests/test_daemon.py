@@ -0,0 +1,34 @@
+import threading
+
+from simple_skidl_parts.daemon import DaemonServer, request
+
+SCRIPT = """
+from skidl import *
+from simple_skidl_parts.analog.vdiv import vdiv
+
+if __name__ == "__main__":
+    vdiv(Net("VIN"), Net("OUT"), Net("GND"), ratio=2.0, rtot=1.2E+6)
+    print(f"parts: {len(default_circuit.parts)}")
+"""
+
+def test_daemon_runs_scripts(tmp_path):
+    script = tmp_path / "design.py"
+    script.write_text(SCRIPT)
+    sock = tmp_path / "daemon.sock"
+
+    server = DaemonServer(sock)
+    t = threading.Thread(target=server.serve)
+    t.start()
+    try:
+        assert request({"cmd": "ping"}, sock)["ok"]
+        for _ in range(2):  # Each run starts from an empty circuit
+            res = request({"cmd": "run", "script": str(script)}, sock)
+            assert res["ok"], res["error"]
+            assert "parts: 2" in res["output"]
+        res = request({"cmd": "run", "script": str(tmp_path / "missing.py")}, sock)
+        assert not res["ok"] and res["error"]
+    finally:
+        request({"cmd": "stop"}, sock)
+        t.join()
+        server.server_close()
+    assert not sock.exists()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from simple_skidl_parts.analog.dc_models import vdiv_dc, reverse_polarity_protection_dc, \
+    low_dropout_power_dc, full_bridge_rectifier_dc
+
+def test_vdiv():
+    assert np.allclose(vdiv_dc([3.0, 6.0], ratio=2), [1.0, 2.0])
+    loaded = vdiv_dc(3.0, ratio=2, rtot=1E+6, r_load=np.array([np.inf, 1E+6]))
+    assert loaded[0] > loaded[1]
+
+def test_reverse_polarity_protection_grid():
+    v_in = np.linspace(-24, 24, 481)[:, None]
+    i_load = np.linspace(0, 2, 21)[None, :]
+    rpp = reverse_polarity_protection_dc(v_in, i_load)
+    assert rpp.v_out.shape == (481, 21)
+    assert np.all(rpp.v_out[v_in[:, 0] <= 0] == 0)
+    assert np.all(rpp.v_out <= np.maximum(v_in, 0))
+    assert np.isclose(rpp.v_out[-1, -1], 24 - 2*0.1)
+
+def test_ldo_dropout():
+    ldo = low_dropout_power_dc(np.array([4.0, 6.0, 12.0]), 0.35, 5.0, add_reverse_polarity_protection=False)
+    assert np.allclose(ldo.v_out, [4.0 - 2.015, 6.0 - 2.015, 5.0])
+    assert list(ldo.in_regulation) == [False, False, True]
+    assert np.isclose(ldo.p_reg[-1], 7*0.35)
+
+def test_rectifier_ripple():
+    res = full_bridge_rectifier_dc(24, np.array([0.0, 1.0]))
+    assert np.isclose(res.v_peak[0], 24*np.sqrt(2) - 2)
+    assert res.v_ripple[0] == 0 and np.isclose(res.v_ripple[1], 1/(2*50*471E-6))
+    assert np.all(res.v_min <= res.v_avg)
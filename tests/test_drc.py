@@ -0,0 +1,46 @@
+from skidl import *
+
+from simple_skidl_parts.analog.capacitors import capacitor
+from simple_skidl_parts.drc import check_ratings, drc_report, set_operating_point, set_ratings
+from simple_skidl_parts.parts_wrapper import TrackedPart
+
+def test_capacitor_rating_from_catalog():
+    reset()
+    gnd, vin = Net("GND"), Net("VIN")
+    c = capacitor(10E-6, 12)
+    c[1] += vin
+    c[2] += gnd
+    assert c.ratings["voltage"] >= 12
+
+    set_operating_point(gnd, voltage=0)
+    set_operating_point(vin, voltage=12)
+    assert check_ratings() == []
+    set_operating_point(vin, voltage=c.ratings["voltage"] + 1)
+    violations = check_ratings()
+    assert [(v.ref, v.kind) for v in violations] == [(c.ref, "voltage")]
+    assert c.ref in drc_report(violations)
+
+def test_margin_current_and_power():
+    reset()
+    gnd, vin = Net("GND"), Net("VIN")
+    r = set_ratings(TrackedPart("Device", "R", value="10K"), current=2.0, power=0.25)
+    r[1] += vin
+    r[2] += gnd
+    set_operating_point(gnd, voltage=0)
+    set_operating_point(vin, voltage=0.1, current=1.5)
+    assert check_ratings() == []
+    assert {v.kind for v in check_ratings(margin=0.5)} == {"current", "power"}
+
+def test_unannotated_nets_are_ignored():
+    reset()
+    vac1, vac2, dcp, dcm = Net("AC1"), Net("AC2"), Net("DC+"), Net("DC-")
+    db = set_ratings(TrackedPart("Diode_Bridge", "ABS2"), voltage=200, current=0.8)
+    vac1 += db[3]
+    vac2 += db[4]
+    dcp += db["+"]
+    dcm += db["-"]
+    assert check_ratings() == []
+    set_operating_point(dcm, voltage=0)
+    set_operating_point(dcp, voltage=150, current=1.0)
+    kinds = {(v.kind, v.rating) for v in check_ratings()}
+    assert ("current", 0.8) in kinds and ("voltage", 200) not in kinds
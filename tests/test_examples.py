@@ -0,0 +1,108 @@
+"""
+Builds every script in examples/ in its own process (in parallel) and compares the result to
+tests/example_baselines.json. An example that fails to build fails its test. Changes in the
+parts, nets or connectivity fail the test, while slower builds or a higher peak memory only warn.
+
+Run with SSP_UPDATE_BASELINES=1 to record the current results (of the examples that build) as
+the baselines. The KiCad libraries are needed for that, CI uploads them when they are missing.
+"""
+
+import builtins
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import resource
+import runpy
+import time
+import traceback
+import warnings
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+EXAMPLES = sorted((Path(__file__).parent.parent / "examples").glob("*.py"))
+BASELINES = Path(__file__).parent / "example_baselines.json"
+TIME_TOLERANCE = 0.5    # Allowed slowdown (relative)
+RSS_TOLERANCE = 0.25    # Allowed peak memory increase (relative)
+
+
+def _digest(lines) -> str:
+    h = hashlib.sha256()
+    for line in lines:
+        h.update(line.encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _netlist_hash(circuit, rounds: int = 3) -> str:
+    """
+    A hash of the parts and their connectivity that doesn't depend on refs, net names or the
+    order things were created in. Every part starts labeled by what it is and is relabeled a few
+    rounds by what its pins are connected to (Weisfeiler-Lehman), the hash is of all the labels.
+    """
+    labels = {id(p): f"{p.name}|{p.value}|{p.footprint}" for p in circuit.parts}
+    for _ in range(rounds):
+        pin_net = {}
+        for net in circuit.get_nets():
+            pins = net.get_pins()
+            net_label = _digest(sorted(f"{labels[id(pin.part)]}.{pin.num}" for pin in pins))
+            pin_net.update((id(pin), net_label) for pin in pins)
+        labels = {id(p): _digest([labels[id(p)]] + sorted(f"{pin.num}:{pin_net.get(id(pin), '')}" for pin in p.pins))
+                  for p in circuit.parts}
+    return _digest(sorted(labels.values()))
+
+
+def _run_example(script: str) -> Dict:
+    # Runs in a fresh process, so skidl's global circuit and ru_maxrss belong to this script only
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(script, run_name="__main__")
+    except Exception:  # Reported as this example's failure, the other examples still run
+        return {"error": traceback.format_exc()}
+    elapsed = time.perf_counter() - start
+
+    circuit = builtins.default_circuit
+    return {
+        "parts": len(circuit.parts),
+        "nets": len(circuit.get_nets()),
+        "netlist_hash": _netlist_hash(circuit),
+        "time": elapsed,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+@pytest.fixture(scope="module")
+def example_results() -> Dict[str, Dict]:
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(maxtasksperchild=1) as pool:
+        results = pool.map(_run_example, [str(e) for e in EXAMPLES], chunksize=1)
+    results = {e.name: r for e, r in zip(EXAMPLES, results)}
+
+    if os.environ.get("SSP_UPDATE_BASELINES"):
+        built = {name: r for name, r in results.items() if "error" not in r}
+        BASELINES.write_text(json.dumps(built, indent=2, sort_keys=True) + "\n")
+    return results
+
+
+@pytest.mark.parametrize("example", [e.name for e in EXAMPLES])
+def test_example(example, example_results):
+    res = example_results[example]
+    assert "error" not in res, f"{example} failed to build:\n{res.get('error')}"
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    if example not in baselines:
+        pytest.skip(f"{example} builds, but has no baseline to compare with (run with SSP_UPDATE_BASELINES=1)")
+    base = baselines[example]
+
+    for key in ("parts", "nets", "netlist_hash"):
+        assert res[key] == base[key], f"{example}: {key} changed from {base[key]} to {res[key]}"
+
+    if res["time"] > base["time"] * (1 + TIME_TOLERANCE):
+        warnings.warn(f"{example}: build time went from {base['time']:.2f}s to {res['time']:.2f}s")
+    if res["max_rss_kb"] > base["max_rss_kb"] * (1 + RSS_TOLERANCE):
+        warnings.warn(f"{example}: peak RSS went from {base['max_rss_kb']}KB to {res['max_rss_kb']}KB")
@@ -0,0 +1,46 @@
+import pytest
+
+from simple_skidl_parts.digital.gpio import Cap, Signal, allocate_gpios, GpioAllocationError, ESP32_S2
+
+
+def test_allocation_respects_capabilities():
+    signals = [
+        Signal("LED", requires=Cap.OUTPUT),
+        Signal("BAT_SENSE", requires=Cap.ADC1),
+        Signal("TOUCH", requires=Cap.TOUCH | Cap.OUTPUT),
+        Signal("DAC", requires=Cap.DAC),
+    ]
+    pins = allocate_gpios(signals)
+    assert len(set(pins.values())) == 4
+    assert pins["LED"] not in ("IO34", "IO35", "IO36", "IO39")
+    assert pins["BAT_SENSE"] in ("IO32", "IO33", "IO34", "IO35", "IO36", "IO39")
+    assert pins["DAC"] in ("IO25", "IO26")
+    assert pins["TOUCH"] not in ("IO00", "IO02", "IO12", "IO15")  # Strapping pins are avoided
+
+
+def test_preferred_pins_first():
+    assert allocate_gpios([Signal("A")]) == {"A": "IO35"}
+    assert allocate_gpios([Signal("A", requires=Cap.OUTPUT)]) == {"A": "IO33"}
+
+
+def test_many_outputs():
+    signals = [Signal(f"OUT{i}", requires=Cap.OUTPUT) for i in range(14)]
+    pins = allocate_gpios(signals)
+    assert len(set(pins.values())) == 14
+
+
+def test_conflict_is_explained():
+    with pytest.raises(GpioAllocationError) as e:
+        allocate_gpios([Signal("DAC1", requires=Cap.DAC), Signal("DAC2", requires=Cap.DAC),
+                        Signal("DAC3", requires=Cap.DAC)])
+    assert "DAC" in str(e.value)
+
+    with pytest.raises(GpioAllocationError):
+        allocate_gpios([Signal("USB_DP", requires=Cap.USB)])
+
+
+def test_reserved_and_other_chips():
+    pins = allocate_gpios([Signal("USB_DP", requires=Cap.USB), Signal("USB_DN", requires=Cap.USB)], chip=ESP32_S2)
+    assert set(pins.values()) == {"IO19", "IO20"}
+    pins = allocate_gpios([Signal("A", requires=Cap.OUTPUT)], reserved=[33])
+    assert pins["A"] != "IO33"
@@ -0,0 +1,120 @@
+import os
+
+from simple_skidl_parts.kicad_index import SymbolIndex, FootprintIndex, validate_footprints
+
+_V5_LIB = """EESchema-LIBRARY Version 2.4
+#encoding utf-8
+#
+# R
+#
+DEF R R 0 0 N Y 1 F N
+ALIAS R_US
+DRAW
+X ~ 1 0 150 50 D 50 50 1 1 P
+X ~ 2 0 -150 50 U 50 50 1 1 P
+ENDDRAW
+ENDDEF
+#
+# C
+#
+DEF C C 0 10 N Y 1 F N
+DRAW
+X ~ 1 0 150 110 D 50 50 1 1 P
+X ~ 2 0 -150 110 U 50 50 1 1 P
+ENDDRAW
+ENDDEF
+#
+#End Library
+"""
+
+_V6_LIB = """(kicad_symbol_lib (version 20211014) (generator kicad_symbol_editor)
+  (symbol "LM7805" (in_bom yes) (on_board yes)
+    (symbol "LM7805_0_1"
+      (pin power_in line (at 0 0 0) (length 2.54) (name "VI") (number "1"))
+    )
+  )
+  (symbol "LM7833" (extends "LM7805")
+    (property "Value" "LM7833" (id 1) (at 0 0 0))
+  )
+)
+"""
+
+def _make_libs(tmp_path):
+    libs = tmp_path / "libs"
+    libs.mkdir()
+    (libs / "Device.lib").write_text(_V5_LIB)
+    (libs / "Regulator_Linear.kicad_sym").write_text(_V6_LIB)
+    return libs
+
+def test_index_locates_and_extracts_symbols(tmp_path):
+    libs = _make_libs(tmp_path)
+    index = SymbolIndex(dirs=[libs], cache_dir=tmp_path / "cache")
+
+    assert index.read_symbol("Device", "C").startswith("DEF C C")
+    assert index.read_symbol("Device", "C").endswith("ENDDEF")
+    assert index.read_symbol("Device", "R_US") == index.read_symbol("Device", "R")
+    assert index.locate("Device", "L") is None
+    assert index.locate("Nope", "R") is None
+
+    lm7833 = index.read_symbol("Regulator_Linear", "LM7833")
+    assert lm7833.index('(symbol "LM7805"') < lm7833.index('(symbol "LM7833"')
+
+    extracted = index.symbol_lib("Device", "C")
+    assert os.path.basename(extracted) == "Device.lib"
+    text = open(extracted).read()
+    assert "DEF C C" in text and "DEF R R" not in text
+
+def test_index_reads_tab_indented_libs(tmp_path):
+    libs = tmp_path / "libs"
+    libs.mkdir()
+    (libs / "Regulator_Linear.kicad_sym").write_text(_V6_LIB.replace("  ", "\t"))
+    index = SymbolIndex(dirs=[libs], cache_dir=tmp_path / "cache")
+    assert index.locate("Regulator_Linear", "LM7833") is not None
+    assert index.locate("Regulator_Linear", "LM7805_0_1") is None
+    assert "LM7805_0_1" in index.read_symbol("Regulator_Linear", "LM7805")
+
+def test_index_is_persisted_and_invalidated(tmp_path):
+    libs = _make_libs(tmp_path)
+    SymbolIndex(dirs=[libs], cache_dir=tmp_path / "cache")
+    assert (tmp_path / "cache" / "symbol_index.json").exists()
+
+    lib = libs / "Device.lib"
+    lib.write_text(_V5_LIB.replace("DEF C C", "DEF C_Small C"))
+    st = lib.stat()
+    os.utime(lib, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    index = SymbolIndex(dirs=[libs], cache_dir=tmp_path / "cache")
+    assert index.locate("Device", "C") is None
+    assert index.read_symbol("Device", "C_Small").startswith("DEF C_Small C")
+
+class _FakePart:
+    def __init__(self, ref, footprint):
+        self.ref, self.footprint = ref, footprint
+
+class _FakeCircuit:
+    def __init__(self, parts):
+        self.parts = parts
+
+def test_footprint_validation(tmp_path):
+    for lib, names in [("Package_TO_SOT_THT", ["TO-220-3_Horizontal_TabDown", "TO-220-3_Vertical"]),
+                       ("Fuse", ["Fuse_Bourns_MF-RG300"]),
+                       ("Fuse_Old", ["Fuse_Bourns_MF-RG300"])]:
+        d = tmp_path / "fp" / f"{lib}.pretty"
+        d.mkdir(parents=True)
+        for n in names:
+            (d / f"{n}.kicad_mod").write_text("(module)")
+    index = FootprintIndex(dirs=[tmp_path / "fp"], cache_dir=tmp_path / "cache")
+
+    parts = [_FakePart(f"Q{i}", "TO-220-3_Horizontal_TabDown") for i in range(5000)]
+    parts += [_FakePart("Q9000", "Package_TO_SOT_THT:TO-220-3_Vertical"),
+              _FakePart("Q9001", "TO-220-3_Horizontl_TabDown"),
+              _FakePart("F1", "Fuse_Bourns_MF-RG300"),
+              _FakePart("U1", None)]
+    issues = {i.footprint: i for i in validate_footprints(_FakeCircuit(parts), index)}
+
+    assert set(issues) == {"TO-220-3_Horizontl_TabDown", "Fuse_Bourns_MF-RG300", None}
+    assert issues["TO-220-3_Horizontl_TabDown"].kind == "unknown"
+    assert issues["TO-220-3_Horizontl_TabDown"].suggestions[0] == "TO-220-3_Horizontal_TabDown"
+    assert issues["Fuse_Bourns_MF-RG300"].kind == "ambiguous"
+    assert issues["Fuse_Bourns_MF-RG300"].refs == ["F1"]
+    assert issues[None].kind == "missing"
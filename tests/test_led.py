@@ -0,0 +1,33 @@
+import pytest
+from skidl import *
+
+from simple_skidl_parts.analog.led import led_bank, led_simple, LedSingleColors, _get_closest_footprint
+
+@pytest.mark.parametrize("size,expected", [(1.6, "LED_0603_1608Metric"), (1.3, "LED_0402_1005Metric"), (2.9, "LED_1206_3216Metric")])
+def test_closest_footprint(size, expected):
+    assert _get_closest_footprint(size) == expected
+
+def test_led_bank():
+    reset()
+    gnd = Net("GND")
+    signals = [Net(f"S{i}") for i in range(100)]
+    pairs = led_bank(signals, gnd, 3.3, LedSingleColors.YELLOW, 1.6)
+
+    assert len(pairs) == 100
+    assert len(default_circuit.parts) == 200
+    assert {led.sku for led, _ in pairs} == {"JLCPCB:C72038"}
+    assert len({r.value for _, r in pairs}) == 1
+    assert all(led.ref.startswith("LED") for led, _ in pairs)
+    assert len(gnd.get_pins()) == 100
+
+def test_led_simple_package_interface():
+    reset()
+    gnd, sig = Net("GND"), Net("SIG")
+    led = led_simple(sig_voltage=3.3, color=LedSingleColors.YELLOW, size=1.6)
+    assert {"signal", "gnd", "sig_voltage", "color", "size"} <= set(dict(led))
+    led.signal += sig
+    led.gnd += gnd
+
+    generate_netlist(file_=open("/tmp/lala.net", "w"))
+    assert len(default_circuit.parts) == 2
+    assert len(sig.get_pins()) == 1 and len(gnd.get_pins()) == 1
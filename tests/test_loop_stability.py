@@ -0,0 +1,31 @@
+from itertools import product
+
+import numpy as np
+
+from simple_skidl_parts.analog import loop_stability as ls
+
+def _design(v_out, i_out):
+    c_out = 4/(2*np.pi*(v_out/i_out)*1E+4)
+    return (v_out, i_out, c_out) + tuple(ls.tps54331_compensation(v_out, i_out, c_out))
+
+def test_compensated_loop_meets_design():
+    margins = ls.analyze_tps54331(*_design(3.3, 1.5))
+    assert 5E+3 < margins.crossover < 2E+4
+    assert 40 < margins.phase_margin < 80
+    assert margins.gain_margin > 10
+
+def test_batch_matches_single_designs():
+    v_outs, i_outs = (np.array(x) for x in zip(*product([1.6, 3.3, 5, 12], [0.5, 1.0, 2.0, 3.0])))
+    batch = ls.analyze_tps54331(*_design(v_outs, i_outs))
+    assert batch.phase_margin.shape == v_outs.shape
+
+    for i, (v, c) in enumerate(zip(v_outs, i_outs)):
+        single = ls.analyze_tps54331(*_design(v, c))
+        assert np.isclose(single.crossover, batch.crossover[i])
+        assert np.isclose(single.phase_margin, batch.phase_margin[i])
+
+def test_no_crossover():
+    freqs = ls.default_frequencies()
+    margins = ls.loop_margins(freqs, np.full(freqs.shape, 0.5+0j))
+    assert np.isnan(margins.crossover) and np.isnan(margins.phase_margin)
+    assert np.isinf(margins.gain_margin)
@@ -0,0 +1,22 @@
+from skidl import *
+
+from simple_skidl_parts.parts_wrapper import TrackedPart
+from simple_skidl_parts.analog.networks import parallel_bank, series_chain
+
+def test_parallel_bank():
+    reset()
+    vcc, gnd = Net("VCC"), Net("GND")
+    caps = parallel_bank(vcc, gnd, TrackedPart("Device", "C", value="100n"), 200)
+
+    assert len(caps) == len(default_circuit.parts) == 200
+    assert all(c.sku == "JLCPCB:C28233" for c in caps)
+    assert len(vcc.get_pins()) == len(gnd.get_pins()) == 200
+
+def test_series_chain():
+    reset()
+    a, b = Net("A"), Net("B")
+    parts = series_chain(a, b, TrackedPart("Device", "R", value="10K"), 3)
+
+    assert len(parts) == 3
+    assert parts[0][1].is_attached(a) and parts[-1][2].is_attached(b)
+    assert parts[0][2].is_attached(parts[1][1]) and not parts[0][2].is_attached(parts[2][1])
@@ -0,0 +1,32 @@
+from skidl import *
+
+from simple_skidl_parts.parts_wrapper import TrackedPart, CachedPart, part_template
+
+def test_parts_are_copied_from_one_template():
+    reset()
+    c1 = TrackedPart("Device", "C", value="10p")
+    c2 = TrackedPart("Device", "C", value="100n")
+    r = CachedPart("Device", "R", value="1K", footprint="R_0805_2012Metric")
+
+    assert part_template("Device", "C", part_class=TrackedPart) is part_template("Device", "C", part_class=TrackedPart)
+    assert isinstance(c1, TrackedPart) and isinstance(r, CachedPart)
+    assert c1 is not c2
+    assert (c1.sku, c2.sku) == ("JLCPCB:C1785", "JLCPCB:C28233")
+    assert c1.footprint == "C_0805_2012Metric"
+    assert len(default_circuit.parts) == 3
+
+def test_pin_index_is_shared_by_copies():
+    reset()
+    u1 = CachedPart("Regulator_Linear", "AMS1117-3.3")
+    u2 = CachedPart("Regulator_Linear", "AMS1117-3.3")
+
+    assert u1["VI"] is u1[3] and u1["VI"] is not u2["VI"]
+    assert u2["VI"].name == "VI"
+    assert u1._pin_index is u2._pin_index
+    assert u1._pin_index[0] == len(u1.pins)
+
+    u2[1].aliases += ["EXTRA"]
+    assert u2["EXTRA"] is u2[1]
+
+    u1.match_pin_regex = True
+    assert len(u1["V.*"]) == 2
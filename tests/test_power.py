@@ -66,3 +66,54 @@ def test_buck_high_range(v_in, voltage_out, max_current):
     ERC()
     
     generate_netlist(file_=open(f"/tmp/buck_reg_test_{v_in}_{voltage_out}_{max_current}.net", "w"))
+
+def test_triac_switch_package_interface():
+    reset()
+    gnd, vac, sig, load1, load2 = Net("GND"), Net("VAC"), Net("SIG"), Net("LOAD1"), Net("LOAD2")
+    otc = pow.optocoupled_triac_switch(ac_voltage_max=24.0)
+    assert {"ac1", "ac2", "signal", "gnd", "load1", "load2", "ac_voltage_max"} <= set(dict(otc))
+    otc.ac1 += vac
+    otc.ac2 += gnd
+    otc.signal += sig
+    otc.gnd += gnd
+    otc.load1 += load1
+    otc.load2 += load2
+
+    generate_netlist(file_=open("/tmp/lala.net", "w"))
+    assert len(sig.get_pins()) == 1
+    assert len(vac.get_pins()) > 0 and len(load1.get_pins()) > 0
+
+@pytest.mark.parametrize("ac_voltage", [12, 24, 48, 110, 120, 220, 230])
+def test_triac_snubber_values(ac_voltage):
+    reset()
+    snub_res, snub_cap = pow._rc_snub_values(ac_voltage)
+    assert snub_res > 0 and snub_cap > 0
+
+    nets = [Net(name) for name in ("AC1", "AC2", "SIG", "GND", "LOAD1", "LOAD2")]
+    pow._optocoupled_triac_switch(*nets, ac_voltage, 2.7, 50.0, 1.5)
+    c_snub = next(p for p in default_circuit.parts if p.name == "C")
+    assert c_snub.value == pow.linear.get_value_name(snub_cap)
+
+@pytest.mark.parametrize("vin_max,vout,max_current", [(35, 5, 0.5), (15, 3.3, 1.0), (5.5, 3.3, 1.0)])
+def test_ldo_limits(vin_max, vout, max_current):
+    reset()
+    gnd, vin, out = Net("GND"), Net("VIN"), Net("VOUT")
+    pow.low_dropout_power(vin, out, gnd, vin_max, vout, max_current, False)
+    assert len(default_circuit.parts) == 3
+
+@pytest.mark.parametrize("vin_max,vout,max_current", [(12, 5, 0.6), (12, 5, 1.0), (16, 3.3, 0.5), (12, 12, 0.5)])
+def test_ldo_beyond_limits(vin_max, vout, max_current):
+    reset()
+    with pytest.raises(NotImplementedError):
+        pow.low_dropout_power(Net("VIN"), Net("VOUT"), Net("GND"), vin_max, vout, max_current, False)
+
+@pytest.mark.parametrize("v_signal,current,expected", [(2.5, 3.9, "AO3400A"), (2.5, 4, "IRLIZ44N"), (3.3, 30, "IRLIZ44N"),
+                                                       (4.5, 4, "IRLZ44N"), (5, 10, "IRLZ44N")])
+def test_logic_mosfet_limits(v_signal, current, expected):
+    reset()
+    assert pow._get_logic_mosfet(v_signal, current).value == expected
+
+@pytest.mark.parametrize("v_signal,current", [(2.4, 1), (2.4, 4), (1.8, 10)])
+def test_logic_mosfet_below_gate_drive(v_signal, current):
+    with pytest.raises(NotImplementedError):
+        pow._get_logic_mosfet(v_signal, current)
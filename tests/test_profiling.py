@@ -0,0 +1,20 @@
+from skidl import *
+
+import simple_skidl_parts.analog.power as pow
+from simple_skidl_parts.profiling import profile
+
+def test_profile_tree():
+    reset()
+    with profile("board") as root:
+        gnd, v12, vout = Net("GND"), Net("V12"), Net("V5")
+        pow.low_dropout_power(v12, vout, gnd, 12, 5, 0.4, True)
+        ERC()
+
+    ldo, = root.children
+    assert ldo.name == "low_dropout_power"
+    rpp, = ldo.children
+    assert rpp.name == "reverse_polarity_protection" and rpp.deferred
+    assert root.parts == len(default_circuit.parts) == ldo.parts + rpp.parts
+    assert root.time >= ldo.time
+    assert root.folded()[1].startswith("board;low_dropout_power ")
+    assert root.to_dict()["children"][0]["children"][0]["name"] == "reverse_polarity_protection"
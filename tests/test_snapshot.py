@@ -0,0 +1,28 @@
+import pytest
+from skidl import *
+
+from simple_skidl_parts.analog.vdiv import vdiv
+from simple_skidl_parts.parts_wrapper import TrackedPart
+import simple_skidl_parts.snapshot as snapshot
+
+pytest.importorskip("msgpack")
+
+def test_snapshot_roundtrip():
+    reset()
+    gnd, vin, vout = Net("GND"), Net("VIN"), Net("OUT")
+    gnd.drive = POWER
+    vdiv(vin, vout, gnd, ratio=2.0, rtot=1.2E+6)  # Values with suggested SKUs
+    c = TrackedPart("Device", "C", value="100n")
+    c[1] += vout
+    c[2] += NC
+
+    data = snapshot.dumps()
+    circ = snapshot.loads(data)
+
+    assert sorted(p.ref for p in circ.parts) == sorted(p.ref for p in default_circuit.parts)
+    restored = {p.ref: p for p in circ.parts}
+    assert restored[c.ref].sku == c.sku and restored[c.ref].footprint == c.footprint
+    out = next(n for n in circ.nets if n.name == "OUT")
+    assert sorted(f"{p.part.ref}.{p.num}" for p in out.get_pins()) == \
+        sorted(f"{p.part.ref}.{p.num}" for p in vout.get_pins())
+    assert next(n for n in circ.nets if n.name == "GND").drive == POWER
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PySpice")
+from skidl import *
+from skidl.pyspice import V, R, gnd, u_V, u_kOhm
+
+from simple_skidl_parts.spice_batch import SpiceJob, run_spice_jobs
+
+def _resistor(r_kohm):
+    from skidl.pyspice import gnd
+    vs = V(ref="VS", dc_value=1 @ u_V)
+    r = R(value=r_kohm @ u_kOhm)
+    vs["p"] += r[1]
+    gnd += vs["n"], r[2]
+
+def test_batch_dc_sweeps(tmp_path):
+    values = [1.0, 2.2, 4.7]
+    jobs = [SpiceJob(_resistor, {"r_kohm": r}, "dc", {"VS": (0, 1, 0.1)}) for r in values]
+    results = run_spice_jobs(jobs, processes=2, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("*.npz"))) == 3
+
+    for r, res in zip(values, results):
+        assert np.allclose(-res["vs"] * r * 1000, res["v-sweep"], atol=1E-3)
+
+    cached = run_spice_jobs(jobs[:1], cache_dir=tmp_path)
+    assert np.array_equal(cached[0]["vs"], results[0]["vs"])
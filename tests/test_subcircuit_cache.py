@@ -0,0 +1,69 @@
+from skidl import *
+
+from simple_skidl_parts.analog.resistors import small_resistor as R
+from simple_skidl_parts.parts_wrapper import TrackedPart
+from simple_skidl_parts.subcircuit_cache import memoize_subcircuit, clear_subcircuit_cache
+
+calls = []
+
+@subcircuit
+@memoize_subcircuit
+def _rc(inp: Net, gnd: Net, r_value: float):
+    calls.append(r_value)
+    mid = Net("MID")
+    inp & R(r_value) & mid & R(r_value) & gnd
+    gnd.drive = POWER
+
+@subcircuit
+@memoize_subcircuit
+def _pull_up(sig: Net, vcc: Net):
+    sig & TrackedPart("Device", "R", value="10K", ref="RPU") & vcc
+
+@subcircuit
+@memoize_subcircuit
+def _two(a: Net, b: Net, c: Net, d: Net):
+    a & R(1000) & b
+    c & R(1000) & d
+
+def test_stamped_copies_match_built():
+    reset()
+    clear_subcircuit_cache()
+    calls.clear()
+
+    gnd = Net("GND")
+    inputs = [Net(f"IN{i}") for i in range(4)]
+    for inp in inputs:
+        _rc(inp, gnd, 1000)
+
+    assert calls == [1000]  # Built only once, the rest was stamped
+    assert len(default_circuit.parts) == 8
+    assert gnd.drive == POWER
+    for inp in inputs:
+        assert len(inp.get_pins()) == 1
+    assert len(gnd.get_pins()) == 4
+
+    _rc(inputs[0], gnd, 2000)
+    assert calls == [1000, 2000]
+
+    ERC()
+
+def test_stamped_copies_keep_explicit_refs():
+    reset()
+    clear_subcircuit_cache()
+    vcc = Net("VCC")
+    for i in range(3):
+        _pull_up(Net(f"SIG{i}"), vcc)
+    assert all(p.ref.startswith("RPU") for p in default_circuit.parts)
+
+def test_aliased_interface_nets_are_keyed_apart():
+    reset()
+    clear_subcircuit_cache()
+    gnd = Net("GND")
+    _two(Net("A1"), gnd, Net("C1"), gnd)
+    b2, d2 = Net("B2"), Net("D2")
+    _two(Net("A2"), b2, Net("C2"), d2)
+    assert len(b2.get_pins()) == 1 and len(d2.get_pins()) == 1
+    assert len(gnd.get_pins()) == 2
+
+    _two(Net("A3"), gnd, Net("C3"), gnd)
+    assert len(gnd.get_pins()) == 4
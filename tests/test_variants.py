@@ -0,0 +1,19 @@
+from skidl import *
+
+from simple_skidl_parts.analog.vdiv import vdiv
+from simple_skidl_parts.variants import build_variants
+
+def _base():
+    return Net("GND"), Net("VIN"), Net("OUT")
+
+def _variant(nets, ratio):
+    gnd, vin, vout = nets
+    vdiv(vin, vout, gnd, ratio=ratio, rtot=1.2E+6)  # Values with suggested SKUs
+
+def test_variants_share_the_base():
+    netlists = build_variants(_base, _variant, [1.0, 2.0, 3.0], processes=2)
+    assert len(netlists) == 3
+    assert len(set(netlists)) == 3
+    assert all("VIN" in n for n in netlists)
+    # The parent's base circuit is not changed by the variants
+    assert len(default_circuit.parts) == 0
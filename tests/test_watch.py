@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+from simple_skidl_parts import subcircuit_cache
+from simple_skidl_parts.watch import Watcher, _dependencies, _library_modules
+import simple_skidl_parts.analog.vdiv
+import simple_skidl_parts.analog.led
+
+def test_dependencies_look_through_subcircuits():
+    deps = _dependencies(_library_modules())
+    assert "simple_skidl_parts.analog.resistors" in deps["simple_skidl_parts.analog.vdiv"]
+    assert "simple_skidl_parts.analog.vdiv" not in deps["simple_skidl_parts.analog.resistors"]
+    assert "simple_skidl_parts.analog.vdiv" not in deps["simple_skidl_parts.analog"]
+
+def test_only_changed_subcircuits_are_forgotten(tmp_path):
+    script = tmp_path / "design.py"
+    script.write_text("")
+    watcher = Watcher(str(script))
+    vdiv_key = ("simple_skidl_parts.analog.vdiv", "vdiv", ())
+    led_key = ("simple_skidl_parts.analog.led", "_led_simple", ())
+    subcircuit_cache._CACHE[vdiv_key] = subcircuit_cache._UNCACHEABLE
+    subcircuit_cache._CACHE[led_key] = subcircuit_cache._UNCACHEABLE
+
+    vdiv_file = Path(sys.modules["simple_skidl_parts.analog.vdiv"].__file__).resolve()
+    assert watcher.reload([watcher.script, vdiv_file]) == ["simple_skidl_parts.analog.vdiv"]
+    assert vdiv_key not in subcircuit_cache._CACHE
+    assert led_key in subcircuit_cache._CACHE
+    subcircuit_cache.clear_subcircuit_cache()